@@ -0,0 +1,297 @@
+"""End-to-end latency benchmarks for mcp-server-git.
+
+Generates a synthetic repository of configurable size with `git fast-import`,
+starts the server over stdio and times every tool through an MCP client
+session, so the numbers include protocol, dispatch and git costs.
+
+    uv run python benchmarks/benchmark_server.py --commits 5000 --files 20000 \\
+        --output results.json
+    uv run python benchmarks/benchmark_server.py --compare results.json
+
+Results are written as JSON and can be compared against an earlier run to spot
+regressions.
+"""
+
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import click
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+AUTHORS = [
+    ("Alice Example", "alice@example.com"),
+    ("Bob Example", "bob@example.com"),
+    ("Carol Example", "carol@example.com"),
+    ("Dave Example", "dave@example.com"),
+]
+WORDS = "cache index parser server client config request response buffer stream".split()
+
+
+@dataclass
+class RepoSpec:
+    commits: int
+    files: int
+    depth: int
+    binary_files: int
+    file_lines: int
+    changes_per_commit: int
+    dirty_files: int
+    seed: int
+
+
+def _line(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(8))
+
+
+def _file_path(index: int, depth: int) -> str:
+    parts = [f"dir{(index >> (3 * level)) % 8}" for level in range(depth)]
+    return "/".join([*parts, f"file{index}.txt"])
+
+
+def _data(payload: bytes) -> bytes:
+    return b"data %d\n" % len(payload) + payload + b"\n"
+
+
+def generate_repository(path: Path, spec: RepoSpec) -> None:
+    """Create a repository at `path` with `spec.commits` commits on `main` and a dirty working tree"""
+    rng = random.Random(spec.seed)
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+    subprocess.run(["git", "symbolic-ref", "HEAD", "refs/heads/main"], cwd=path, check=True)
+
+    paths = [_file_path(i, spec.depth) for i in range(spec.files)]
+    contents = {p: [_line(rng) for _ in range(spec.file_lines)] for p in paths}
+    binaries = [f"assets/blob{i}.bin" for i in range(spec.binary_files)]
+
+    importer = subprocess.Popen(["git", "fast-import", "--quiet"], cwd=path, stdin=subprocess.PIPE)
+    assert importer.stdin is not None
+    timestamp = 1_600_000_000
+    for number in range(1, spec.commits + 1):
+        name, email = rng.choice(AUTHORS)
+        timestamp += rng.randint(60, 3600)
+        message = f"Update {rng.choice(WORDS)} handling ({number})".encode()
+        importer.stdin.write(b"commit refs/heads/main\n")
+        importer.stdin.write(b"mark :%d\n" % number)
+        for role in (b"author", b"committer"):
+            importer.stdin.write(b"%s %s <%s> %d +0000\n" % (role, name.encode(), email.encode(), timestamp))
+        importer.stdin.write(_data(message))
+        if number > 1:
+            importer.stdin.write(b"from :%d\n" % (number - 1))
+
+        if number == 1:
+            changed = paths
+            changed_binaries = binaries
+        else:
+            changed = rng.sample(paths, min(spec.changes_per_commit, len(paths)))
+            changed_binaries = [b for b in binaries if rng.random() < 0.05]
+        for file_path in changed:
+            lines = contents[file_path]
+            if number > 1:
+                lines[rng.randrange(len(lines))] = _line(rng)
+            importer.stdin.write(f"M 100644 inline {file_path}\n".encode())
+            importer.stdin.write(_data("\n".join(lines).encode() + b"\n"))
+        for blob_path in changed_binaries:
+            importer.stdin.write(f"M 100644 inline {blob_path}\n".encode())
+            importer.stdin.write(_data(rng.randbytes(4096)))
+    importer.stdin.close()
+    if importer.wait() != 0:
+        raise RuntimeError("git fast-import failed")
+
+    subprocess.run(["git", "checkout", "-q", "-f", "main"], cwd=path, check=True)
+    for config in (["user.name", "Benchmark"], ["user.email", "benchmark@example.com"]):
+        subprocess.run(["git", "config", *config], cwd=path, check=True)
+
+    # Leave some changes around for status/diff/add: half staged, half not
+    dirty = rng.sample(paths, min(spec.dirty_files, len(paths)))
+    for i, file_path in enumerate(dirty):
+        with open(path / file_path, "a") as f:
+            f.write(_line(rng) + "\n")
+        if i % 2:
+            subprocess.run(["git", "add", file_path], cwd=path, check=True)
+    (path / "untracked.txt").write_text("untracked\n")
+
+
+Operation = tuple[str, str, Callable[[int], dict[str, Any]]]
+
+
+def operations(repo: Path, spec: RepoSpec, scratch: Path) -> list[Operation]:
+    """(label, tool, arguments for iteration i) for every tool; read-only tools first"""
+    repo_path = str(repo)
+    sample_file = _file_path(spec.files // 2, spec.depth)
+    history = min(spec.commits - 1, 100)
+
+    def args(**kwargs: Any) -> Callable[[int], dict[str, Any]]:
+        return lambda _: {"repo_path": repo_path, **kwargs}
+
+    return [
+        ("status", "git_status", args()),
+        ("status_porcelain", "git_status", args(porcelain=True)),
+        ("status_porcelain_no_untracked", "git_status", args(porcelain=True, untracked=False)),
+        ("diff_unstaged", "git_diff_unstaged", args()),
+        ("diff_staged", "git_diff_staged", args()),
+        ("diff", "git_diff", args(target=f"HEAD~{history}")),
+        ("diff_summary", "git_diff", args(target=f"HEAD~{history}", summary=True)),
+        ("diff_path", "git_diff", args(target=f"HEAD~{history}", paths=[sample_file])),
+        ("log", "git_log", args()),
+        ("log_1000", "git_log", args(max_count=1000)),
+        ("log_path", "git_log", args(paths=[sample_file])),
+        ("log_author", "git_log", args(author="Carol", max_count=100)),
+        ("show", "git_show", args(revision="HEAD")),
+        ("show_root", "git_show", args(revision=f"HEAD~{spec.commits - 1}")),
+        ("search_commits_query", "git_search_commits", args(query="cache")),
+        ("search_commits_path", "git_search_commits", args(path=sample_file)),
+        ("read_file", "git_read_file", args(revision="HEAD", path=sample_file, start_line=1, end_line=20)),
+        ("blame", "git_blame", args(path=sample_file, start_line=1, end_line=20)),
+        ("add", "git_add", args(files=["*.txt"])),
+        ("reset", "git_reset", args()),
+        ("create_branch", "git_create_branch", lambda i: {"repo_path": repo_path, "branch_name": f"bench-{i}"}),
+        (
+            "checkout",
+            "git_checkout",
+            lambda i: {"repo_path": repo_path, "branch_name": f"bench-{i}" if i % 2 == 0 else "main"},
+        ),
+        ("commit", "git_commit", lambda i: {"repo_path": repo_path, "message": f"Benchmark commit {i}"}),
+        ("init", "git_init", lambda i: {"repo_path": str(scratch / f"init-{i}")}),
+    ]
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))]
+    return {
+        "min_ms": round(ordered[0] * 1000, 3),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+async def run_benchmarks(
+    repo: Path,
+    spec: RepoSpec,
+    iterations: int,
+    server_args: list[str],
+) -> dict[str, Any]:
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "mcp_server_git", *server_args],
+        env=dict(os.environ),
+    )
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        async with stdio_client(params) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                for label, tool, arguments in operations(repo, spec, Path(scratch)):
+                    timings = []
+                    errors = []
+                    for i in range(iterations):
+                        start = time.perf_counter()
+                        result = await session.call_tool(tool, arguments(i))
+                        timings.append(time.perf_counter() - start)
+                        if result.isError:
+                            errors.append(result.content[0].text if result.content else "")
+                    results[label] = {"tool": tool, "iterations": iterations, **summarize(timings)}
+                    if errors:
+                        results[label]["errors"] = errors[:3]
+                    click.echo(f"{label:32} {results[label]['median_ms']:>10.1f} ms", err=True)
+    return results
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> None:
+    click.echo(f"{'operation':32} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for label, result in current["results"].items():
+        before = baseline["results"].get(label)
+        if before is None:
+            click.echo(f"{label:32} {'-':>12} {result['median_ms']:>10.1f}ms {'new':>8}")
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        flag = "  <-- slower" if ratio > 1.2 else ""
+        click.echo(
+            f"{label:32} {before['median_ms']:>10.1f}ms {result['median_ms']:>10.1f}ms {ratio:>7.2f}x{flag}"
+        )
+
+
+@click.command()
+@click.option("--commits", default=2000, show_default=True, help="Length of the generated history")
+@click.option("--files", default=5000, show_default=True, help="Number of text files in the tree")
+@click.option("--depth", default=3, show_default=True, help="Directory nesting depth of the files")
+@click.option("--binary-files", default=20, show_default=True, help="Number of 4 KiB binary blobs")
+@click.option("--file-lines", default=40, show_default=True, help="Lines per text file")
+@click.option("--changes-per-commit", default=5, show_default=True, help="Files modified by each commit")
+@click.option("--dirty-files", default=50, show_default=True, help="Files left modified in the working tree")
+@click.option("--seed", default=0, show_default=True)
+@click.option("--iterations", default=5, show_default=True, help="Calls per operation")
+@click.option("--repo", type=Path, help="Reuse (or create) the synthetic repository at this path")
+@click.option("--commit-index", is_flag=True, help="Start the server with --commit-index")
+@click.option("--output", type=Path, help="Write results as JSON to this file")
+@click.option("--compare", "baseline", type=Path, help="Compare results against an earlier JSON output")
+def main(
+    commits: int,
+    files: int,
+    depth: int,
+    binary_files: int,
+    file_lines: int,
+    changes_per_commit: int,
+    dirty_files: int,
+    seed: int,
+    iterations: int,
+    repo: Path | None,
+    commit_index: bool,
+    output: Path | None,
+    baseline: Path | None,
+) -> None:
+    """Benchmark every mcp-server-git tool against a synthetic repository"""
+    spec = RepoSpec(commits, files, depth, binary_files, file_lines, changes_per_commit, dirty_files, seed)
+    workdir = None
+    if repo is None:
+        workdir = Path(tempfile.mkdtemp(prefix="mcp-git-bench-"))
+        repo = workdir / "repo"
+    try:
+        if not (repo / ".git").exists():
+            click.echo(f"Generating repository at {repo}", err=True)
+            start = time.perf_counter()
+            generate_repository(repo, spec)
+            click.echo(f"Generated in {time.perf_counter() - start:.1f}s", err=True)
+
+        server_args = ["--commit-index"] if commit_index else []
+        results = asyncio.run(run_benchmarks(repo, spec, iterations, server_args))
+    finally:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    git_version = subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip()
+    report = {
+        "metadata": {
+            "repo": asdict(spec),
+            "iterations": iterations,
+            "commit_index": commit_index,
+            "git": git_version,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    if output is not None:
+        output.write_text(json.dumps(report, indent=2) + "\n")
+    if baseline is not None:
+        compare(json.loads(baseline.read_text()), report)
+    elif output is None:
+        click.echo(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,21 @@ from .server import serve
 
 @click.command()
 @click.option("--repository", "-r", type=Path, help="Git repository path")
+@click.option(
+    "--timeout",
+    type=float,
+    default=300.0,
+    show_default=True,
+    help="Seconds before a git operation is cancelled (0 disables the limit)",
+)
+@click.option(
+    "--commit-index/--no-commit-index",
+    default=False,
+    help="Keep an on-disk SQLite index of commit metadata in each repository's git dir "
+    "to answer git_search_commits without walking history",
+)
 @click.option("-v", "--verbose", count=True)
-def main(repository: Path | None, verbose: bool) -> None:
+def main(repository: Path | None, timeout: float, commit_index: bool, verbose: bool) -> None:
     """MCP Git Server - Git functionality for MCP"""
     import asyncio
 
@@ -18,7 +31,7 @@ def main(repository: Path | None, verbose: bool) -> None:
         logging_level = logging.DEBUG
 
     logging.basicConfig(level=logging_level, stream=sys.stderr)
-    asyncio.run(serve(repository))
+    asyncio.run(serve(repository, timeout or None, commit_index))
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,17 @@
+import asyncio
 import logging
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import closing, contextmanager, nullcontext
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Sequence
+from typing import Any, Callable, Iterator, Literal, Sequence, TypeVar
 from mcp.server import Server
 from mcp.server.session import ServerSession
 from mcp.server.stdio import stdio_server
@@ -10,23 +21,60 @@ from mcp.types import (
     Tool,
     ListRootsResult,
     RootsCapability,
+    RootsListChangedNotification,
 )
 from enum import Enum
 import git
 from pydantic import BaseModel
 
+T = TypeVar("T")
+
+# Default page size for diff-producing tools, roughly 25k tokens of patch text
+DEFAULT_MAX_BYTES = 100_000
+GIT_READ_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_STATUS_ENTRIES = 1000
+DEFAULT_BLOB_CACHE_BYTES = 64 * 1024 * 1024
+# Repositories queried at once by the *_all fan-out tools
+FAN_OUT_PARALLELISM = 8
+# git_show answers with a per-file summary instead of patches for commits
+# touching more files than this, unless told otherwise
+SHOW_PATCH_MAX_FILES = 50
+# Commits written per transaction while building the commit index
+COMMIT_INDEX_BATCH_SIZE = 2000
+
 class GitStatus(BaseModel):
     repo_path: str
+    porcelain: bool = False
+    untracked: bool = True
+    max_entries: int = DEFAULT_MAX_STATUS_ENTRIES
 
 class GitDiffUnstaged(BaseModel):
     repo_path: str
+    paths: list[str] | None = None
+    summary: bool = False
+    offset: int = 0
+    max_bytes: int = DEFAULT_MAX_BYTES
 
 class GitDiffStaged(BaseModel):
     repo_path: str
+    paths: list[str] | None = None
+    summary: bool = False
+    offset: int = 0
+    max_bytes: int = DEFAULT_MAX_BYTES
 
 class GitDiff(BaseModel):
     repo_path: str
     target: str
+    paths: list[str] | None = None
+    summary: bool = False
+    offset: int = 0
+    max_bytes: int = DEFAULT_MAX_BYTES
+    renames: bool = True
+    rename_limit: int | None = None
+    find_copies: bool = False
+    diff_algorithm: Literal["myers", "minimal", "patience", "histogram"] | None = None
+    ignore_whitespace: Literal["all", "change", "at-eol", "blank-lines"] | None = None
+    time_budget: float | None = None
 
 class GitCommit(BaseModel):
     repo_path: str
@@ -42,6 +90,11 @@ class GitReset(BaseModel):
 class GitLog(BaseModel):
     repo_path: str
     max_count: int = 10
+    skip: int = 0
+    author: str | None = None
+    since: str | None = None
+    until: str | None = None
+    paths: list[str] | None = None
 
 class GitCreateBranch(BaseModel):
     repo_path: str
@@ -55,10 +108,739 @@ class GitCheckout(BaseModel):
 class GitShow(BaseModel):
     repo_path: str
     revision: str
+    paths: list[str] | None = None
+    summary: bool | None = None
+    offset: int = 0
+    max_bytes: int = DEFAULT_MAX_BYTES
 
 class GitInit(BaseModel):
     repo_path: str
 
+class GitSearchCommits(BaseModel):
+    repo_path: str
+    query: str | None = None
+    author: str | None = None
+    path: str | None = None
+    since: str | None = None
+    until: str | None = None
+    max_count: int = 20
+
+class GitReadFile(BaseModel):
+    repo_path: str
+    revision: str
+    path: str
+    start_line: int | None = None
+    end_line: int | None = None
+
+class GitBlame(BaseModel):
+    repo_path: str
+    path: str
+    revision: str | None = None
+    start_line: int | None = None
+    end_line: int | None = None
+
+class GitStatusAll(BaseModel):
+    repo_paths: list[str] | None = None
+    porcelain: bool = True
+    untracked: bool = True
+    max_entries: int = 100
+
+class GitLogAll(BaseModel):
+    repo_paths: list[str] | None = None
+    max_count: int = 20
+    author: str | None = None
+    since: str | None = None
+    until: str | None = None
+
+class GitSearchCommitsAll(BaseModel):
+    repo_paths: list[str] | None = None
+    query: str | None = None
+    author: str | None = None
+    path: str | None = None
+    since: str | None = None
+    until: str | None = None
+    max_count: int = 20
+
+class RepoCache:
+    """Bounded LRU of open `git.Repo` handles keyed by resolved path.
+
+    Opening a `git.Repo` re-discovers the git dir, re-reads config and later
+    spawns fresh `git cat-file` processes, so handles are reused across tool
+    calls and closed when they fall out of the cache. Handles taken with `use`
+    are only closed once the last call using them is done.
+    """
+
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self._repos: OrderedDict[Path, git.Repo] = OrderedDict()
+        self._locks: dict[Path, threading.Lock] = {}
+        # Calls currently using each handle, and evicted handles waiting for them
+        self._users: dict[int, int] = {}
+        self._retired: dict[int, git.Repo] = {}
+        self._lock = threading.Lock()
+
+    def get(self, repo_path: Path | str) -> git.Repo:
+        return self._get(repo_path, acquire=False)
+
+    @contextmanager
+    def use(self, repo_path: Path | str) -> Iterator[git.Repo]:
+        """The cached handle for `repo_path`, kept open until the block exits even if evicted"""
+        repo = self._get(repo_path, acquire=True)
+        try:
+            yield repo
+        finally:
+            with self._lock:
+                users = self._users.pop(id(repo)) - 1
+                if users:
+                    self._users[id(repo)] = users
+                retired = self._retired.pop(id(repo), None) if not users else None
+            if retired is not None:
+                retired.close()
+
+    def ensure_capacity(self, count: int) -> None:
+        """Grow the cache so that `count` repositories fit, e.g. all of a workspace's roots"""
+        with self._lock:
+            self.maxsize = max(self.maxsize, count)
+
+    def _get(self, repo_path: Path | str, acquire: bool) -> git.Repo:
+        key = Path(repo_path).resolve()
+        closing_: list[git.Repo] = []
+        with self._lock:
+            repo = self._repos.get(key)
+            if repo is not None:
+                if Path(repo.git_dir).is_dir():
+                    self._repos.move_to_end(key)
+                    return self._acquire(repo) if acquire else repo
+                # The repository was removed from under us
+                self._retire(self._repos.pop(key), closing_)
+        for handle in closing_:
+            handle.close()
+
+        # Opening a repository touches the filesystem, so it happens outside
+        # the lock; a handle opened concurrently by another thread wins
+        opened = git.Repo(key)
+        closing_ = []
+        with self._lock:
+            repo = self._repos.get(key)
+            if repo is None:
+                repo = self._repos[key] = opened
+                while len(self._repos) > self.maxsize:
+                    self._retire(self._repos.popitem(last=False)[1], closing_)
+            else:
+                self._repos.move_to_end(key)
+                closing_.append(opened)
+            if acquire:
+                self._acquire(repo)
+        for handle in closing_:
+            handle.close()
+        return repo
+
+    def _acquire(self, repo: git.Repo) -> git.Repo:
+        self._users[id(repo)] = self._users.get(id(repo), 0) + 1
+        return repo
+
+    def _retire(self, repo: git.Repo, closing_: list[git.Repo]) -> None:
+        """Close `repo` once nothing uses it; called with the lock held"""
+        if id(repo) in self._users:
+            self._retired[id(repo)] = repo
+        else:
+            closing_.append(repo)
+
+    def lock_for(self, repo_path: Path | str) -> threading.Lock:
+        """Lock serializing operations that mutate or share a repository's object database"""
+        key = Path(repo_path).resolve()
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def invalidate(self, repo_path: Path | str) -> None:
+        key = Path(repo_path).resolve()
+        closing_: list[git.Repo] = []
+        with self._lock:
+            repo = self._repos.pop(key, None)
+            if repo is not None:
+                self._retire(repo, closing_)
+        for handle in closing_:
+            handle.close()
+
+    def clear(self) -> None:
+        closing_: list[git.Repo] = []
+        with self._lock:
+            for repo in self._repos.values():
+                self._retire(repo, closing_)
+            self._repos.clear()
+        for repo in closing_:
+            repo.close()
+
+    def __len__(self) -> int:
+        return len(self._repos)
+
+class BlobCache:
+    """LRU of blob contents keyed by object id, bounded by total size.
+
+    Blobs are immutable and content addressed, so entries never go stale and
+    can be shared between repositories.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_BLOB_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._blobs: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, hexsha: str) -> bytes | None:
+        with self._lock:
+            data = self._blobs.get(hexsha)
+            if data is not None:
+                self._blobs.move_to_end(hexsha)
+            return data
+
+    def put(self, hexsha: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if hexsha in self._blobs:
+                return
+            self._blobs[hexsha] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self._blobs.popitem(last=False)
+                self.size -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+class GitOperationCancelled(Exception):
+    pass
+
+class GitOperation:
+    """Git subprocesses spawned on behalf of a single tool call.
+
+    Tool handlers run on worker threads. When a call times out or is cancelled
+    every process started through `run_git` is killed, so the worker returns
+    promptly instead of finishing work whose result nobody will read.
+    """
+
+    _local = threading.local()
+
+    def __init__(self):
+        self._processes: set[subprocess.Popen] = set()
+        self._lock = threading.Lock()
+        self.cancelled = False
+
+    @classmethod
+    def current(cls) -> "GitOperation | None":
+        return getattr(cls._local, "operation", None)
+
+    def run(self, func: Callable[..., T], *args: Any) -> T:
+        GitOperation._local.operation = self
+        try:
+            self.check()
+            return func(*args)
+        finally:
+            GitOperation._local.operation = None
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise GitOperationCancelled("Git operation was cancelled")
+
+    def popen(self, args: list[str], **kwargs: Any) -> subprocess.Popen:
+        with self._lock:
+            self.check()
+            process = subprocess.Popen(args, **kwargs)
+            self._processes.add(process)
+            return process
+
+    def release(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.discard(process)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            processes = list(self._processes)
+        for process in processes:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+
+async def run_git_operation(
+    executor: Executor | None,
+    timeout: float | None,
+    func: Callable[..., T],
+    *args: Any,
+) -> T:
+    """Run a blocking git handler on `executor`, killing its git processes on timeout or cancellation"""
+    operation = GitOperation()
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(executor, operation.run, func, *args)
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        operation.cancel()
+        raise TimeoutError(f"Git operation timed out after {timeout} seconds")
+    except asyncio.CancelledError:
+        operation.cancel()
+        raise
+
+async def fan_out(
+    executor: Executor | None,
+    timeout: float | None,
+    repo_paths: Sequence[str],
+    func: Callable[[str], T],
+    max_parallel: int = FAN_OUT_PARALLELISM,
+) -> list[tuple[str, T | Exception]]:
+    """Run `func(repo_path)` for every repository, at most `max_parallel` at a time.
+
+    Each repository gets its own `GitOperation` and timeout; failures are
+    returned in place of results so one broken repository does not hide the
+    others.
+    """
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def run_one(repo_path: str) -> tuple[str, T | Exception]:
+        async with semaphore:
+            try:
+                return repo_path, await run_git_operation(executor, timeout, func, repo_path)
+            except Exception as e:
+                return repo_path, e
+
+    return list(await asyncio.gather(*(run_one(repo_path) for repo_path in repo_paths)))
+
+def merge_log_entries(results: list[tuple[str, list[str] | Exception]], max_count: int) -> list[str]:
+    """Merge per-repository log entries newest first, labelling each with its repository"""
+    entries = []
+    errors = []
+    for repo_path, result in results:
+        if isinstance(result, Exception):
+            errors.append(f"Repository: {repo_path}\nError: {result}\n")
+            continue
+        for entry in result:
+            date = entry.split("\n", 3)[2].removeprefix("Date: ")
+            authored = datetime.strptime(date, "%Y-%m-%d %H:%M:%S %z")
+            entries.append((authored, f"Repository: {repo_path}\n{entry}"))
+    entries.sort(key=lambda item: item[0], reverse=True)
+    return [entry for _, entry in entries[:max_count]] + errors
+
+def popen_git(repo: git.Repo, args: Sequence[str], **kwargs: Any) -> subprocess.Popen:
+    """Start a git command in `repo`.
+
+    The process is registered with the current `GitOperation`, if any, so that
+    it can be killed when the tool call is cancelled. Callers must pass it to
+    `GitOperation.release` once it has exited.
+    """
+    command = [git.Git.GIT_PYTHON_GIT_EXECUTABLE or "git", *args]
+    operation = GitOperation.current()
+    popen = operation.popen if operation is not None else subprocess.Popen
+    kwargs.setdefault("stdin", subprocess.DEVNULL)
+    return popen(
+        command,
+        cwd=repo.working_tree_dir or repo.git_dir,
+        stdout=subprocess.PIPE,
+        **kwargs,
+    )
+
+def _finish_git(process: subprocess.Popen) -> None:
+    operation = GitOperation.current()
+    if operation is not None:
+        operation.release(process)
+        operation.check()
+
+def run_git(repo: git.Repo, *args: str, input: bytes | None = None) -> str:
+    """Run a git command in `repo`, optionally feeding `input` to its stdin, and return its output"""
+    stdin = subprocess.PIPE if input is not None else subprocess.DEVNULL
+    process = popen_git(repo, args, stdin=stdin, stderr=subprocess.PIPE)
+    try:
+        stdout, stderr = process.communicate(input)
+    finally:
+        _finish_git(process)
+
+    if process.returncode != 0:
+        raise git.GitCommandError(process.args, process.returncode, stderr, stdout)
+    output = stdout.decode("utf-8", errors="replace")
+    return output[:-1] if output.endswith("\n") else output
+
+def run_git_paged(
+    repo: git.Repo,
+    args: Sequence[str],
+    offset: int = 0,
+    max_bytes: int | None = DEFAULT_MAX_BYTES,
+    time_budget: float | None = None,
+) -> str:
+    """Run a git command in `repo` and return at most `max_bytes` of its output starting at `offset`.
+
+    Output is streamed from the subprocess and the process is killed as soon
+    as the page is full, so huge diffs are never held in memory. Truncated
+    pages end on a line boundary where possible and carry a note with the
+    offset of the next page.
+
+    If `time_budget` is given and git produces no output within that many
+    seconds it is killed and TimeoutError is raised.
+    """
+    if offset < 0:
+        raise ValueError("offset must not be negative")
+    if max_bytes is not None and max_bytes <= 0:
+        raise ValueError("max_bytes must be positive")
+
+    with tempfile.TemporaryFile() as stderr:
+        process = popen_git(repo, args, stderr=stderr)
+        assert process.stdout is not None
+        expired = threading.Event()
+
+        def expire() -> None:
+            expired.set()
+            process.kill()
+
+        timer = threading.Timer(time_budget, expire) if time_budget is not None else None
+        if timer is not None:
+            timer.start()
+        chunks: list[bytes] = []
+        size = 0
+        skipped = 0
+        truncated = False
+        try:
+            while chunk := process.stdout.read(GIT_READ_CHUNK_SIZE):
+                if timer is not None:
+                    timer.cancel()
+                if skipped < offset:
+                    skip = min(offset - skipped, len(chunk))
+                    skipped += skip
+                    chunk = chunk[skip:]
+                chunks.append(chunk)
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    truncated = True
+                    break
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if truncated:
+                process.kill()
+            process.stdout.close()
+            process.wait()
+            _finish_git(process)
+
+        if expired.is_set():
+            raise TimeoutError(f"git {args[0]} produced no output within {time_budget} seconds")
+        if not truncated and process.returncode != 0:
+            stderr.seek(0)
+            raise git.GitCommandError(process.args, process.returncode, stderr.read())
+
+    data = b"".join(chunks)
+    if not truncated:
+        output = data.decode("utf-8", errors="replace")
+        return output[:-1] if output.endswith("\n") else output
+
+    assert max_bytes is not None
+    end = data.rfind(b"\n", 0, max_bytes) + 1 or max_bytes
+    page = data[:end].decode("utf-8", errors="replace")
+    return f"{page}\n[Output truncated; call again with offset={offset + end} to continue]"
+
+def iter_git_records(
+    repo: git.Repo, args: Sequence[str], separator: bytes, input: bytes | None = None
+) -> Iterator[bytes]:
+    """Stream the output of a git command in `repo` as `separator`-delimited records
+
+    `input` is written to the command's stdin up front, so it is only suitable
+    for commands that read all of their input before producing output, such
+    as `rev-list --stdin`.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        if input is None:
+            process = popen_git(repo, args, stderr=stderr)
+        else:
+            process = popen_git(repo, args, stderr=stderr, stdin=subprocess.PIPE)
+            assert process.stdin is not None
+            with process.stdin:
+                process.stdin.write(input)
+        assert process.stdout is not None
+        completed = False
+        try:
+            pending = b""
+            while chunk := process.stdout.read(GIT_READ_CHUNK_SIZE):
+                *records, pending = (pending + chunk).split(separator)
+                yield from (record for record in records if record)
+            if pending:
+                yield pending
+            completed = True
+        finally:
+            if not completed:
+                process.kill()
+            process.stdout.close()
+            process.wait()
+            _finish_git(process)
+
+        if process.returncode != 0:
+            stderr.seek(0)
+            raise git.GitCommandError(process.args, process.returncode, stderr.read())
+
+def diff_options(arguments: dict, summary: bool | None = False) -> dict[str, Any]:
+    """Extract the shared paging/filter arguments of the diff-producing tools"""
+    return {
+        "paths": arguments.get("paths"),
+        "summary": arguments.get("summary", summary),
+        "offset": arguments.get("offset", 0),
+        "max_bytes": arguments.get("max_bytes", DEFAULT_MAX_BYTES),
+    }
+
+def diff_args(paths: Sequence[str] | None, summary: bool) -> list[str]:
+    args = ["--numstat"] if summary else []
+    if paths:
+        args += ["--", *paths]
+    return args
+
+def _to_timestamp(value: str) -> int:
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+def _fts_phrases(text: str) -> str:
+    """Quote each word of `text` as an FTS5 prefix phrase, so `cache` also matches `cached`"""
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in text.split())
+
+class CommitIndex:
+    """On-disk SQLite index of commit metadata and changed paths for one repository.
+
+    The index lives in the repository's common git dir. Commits are keyed by
+    hash and never removed, and the index remembers the tips whose history it
+    holds, so bringing it up to date after a commit, amend, rebase or branch
+    switch only walks the commits that are new. Searches skip indexed commits
+    that are not reachable from HEAD.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tips (
+            hexsha TEXT PRIMARY KEY,
+            -- 1 once every ancestor is indexed, 0 while a build towards it is unfinished
+            complete INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS commits (
+            id INTEGER PRIMARY KEY,
+            hexsha TEXT NOT NULL UNIQUE,
+            author TEXT NOT NULL,
+            author_email TEXT NOT NULL,
+            authored_at INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            message TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS commits_authored_at ON commits (authored_at);
+        CREATE TABLE IF NOT EXISTS commit_paths (
+            commit_id INTEGER NOT NULL REFERENCES commits (id),
+            path TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS commit_paths_path ON commit_paths (path, commit_id);
+    """
+
+    # %x1e starts each commit record; with --name-only -z the changed paths
+    # follow the header as NUL-terminated names.
+    LOG_FORMAT = "%x1e%H%x1f%an%x1f%ae%x1f%at%x1f%ai%x1f%B%x1f"
+
+    def __init__(self, repo: git.Repo):
+        self.repo = repo
+        self.path = Path(repo.common_dir) / "mcp-server-git" / "commits.sqlite3"
+        self.path.parent.mkdir(exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.executescript(self.SCHEMA)
+        self.fts = self._create_fts()
+
+    def _create_fts(self) -> bool:
+        try:
+            self.conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS commit_text "
+                "USING fts5(message, author, content='commits', content_rowid='id')"
+            )
+            return True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5, fall back to LIKE scans
+            return False
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _tips(self, complete: bool | None = None) -> list[str]:
+        if complete is None:
+            return [row[0] for row in self.conn.execute("SELECT hexsha FROM tips")]
+        return [row[0] for row in self.conn.execute("SELECT hexsha FROM tips WHERE complete = ?", (complete,))]
+
+    def update(self) -> int:
+        """Index commits reachable from HEAD that are not indexed yet; returns how many were added
+
+        Only `rev-list HEAD --not <complete tips>` is walked. Commits are written
+        in batches of COMMIT_INDEX_BATCH_SIZE, each in its own transaction, so a
+        build that is interrupted, for instance by the tool call timing out,
+        keeps the batches it finished and the next call carries on from there.
+        """
+        try:
+            head = run_git(self.repo, "rev-parse", "--verify", "--quiet", "HEAD")
+        except git.GitCommandError:
+            return 0  # No commits yet
+
+        complete = self._tips(complete=True)
+        if head in complete:
+            return 0
+        with self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO tips (hexsha, complete) VALUES (?, 0)", (head,))
+
+        # Oldest first, so that ids follow history and break author date ties.
+        # rev-list only lists hashes; metadata is read per batch with `git log --stdin`.
+        revisions = "".join(f"{revision}\n" for revision in [head, *(f"^{tip}" for tip in complete)])
+        hexshas = (
+            record.decode()
+            for record in iter_git_records(
+                self.repo, ["rev-list", "--reverse", "--ignore-missing", "--stdin"], b"\n", revisions.encode()
+            )
+        )
+        added = 0
+        while batch := list(islice(hexshas, COMMIT_INDEX_BATCH_SIZE)):
+            added += self._index_batch(batch)
+
+        with self.conn:
+            self.conn.execute("UPDATE tips SET complete = 1 WHERE hexsha = ?", (head,))
+            self._prune_tips()
+        return added
+
+    def _prune_tips(self) -> None:
+        """Forget tips that no longer exist or whose history another tip already covers"""
+        tips = self._tips()
+        checked = run_git(
+            self.repo, "cat-file", "--batch-check=%(objectname) %(objecttype)",
+            input="".join(f"{tip}\n" for tip in tips).encode(),
+        )
+        existing = {line.split()[0] for line in checked.splitlines() if line.endswith(" commit")}
+        redundant = set(tips) - existing
+
+        complete = [tip for tip in self._tips(complete=True) if tip in existing]
+        pending = [tip for tip in self._tips(complete=False) if tip in existing]
+        if len(complete) > 1:
+            redundant |= set(complete) - set(run_git(self.repo, "merge-base", "--independent", *complete).split())
+        if pending:
+            # An unfinished build whose tip is now an ancestor of a complete one is done
+            independent = set(run_git(self.repo, "merge-base", "--independent", *pending, *complete).split())
+            redundant |= set(pending) - independent
+        self.conn.executemany("DELETE FROM tips WHERE hexsha = ?", ((tip,) for tip in redundant))
+
+    def _mark_unreachable(self) -> None:
+        """Fill temp.unreachable with indexed commits that HEAD cannot reach
+
+        These are the commits reachable from a recorded tip but not from HEAD,
+        such as amended commits or other branches, so the walk stops at their
+        merge base with HEAD.
+        """
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS unreachable (hexsha TEXT PRIMARY KEY)")
+        with self.conn:
+            self.conn.execute("DELETE FROM unreachable")
+            tips = self._tips()
+            if not tips:
+                return
+            revisions = "".join(f"{revision}\n" for revision in [*tips, "^HEAD"])
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO unreachable (hexsha) VALUES (?)",
+                (
+                    (record.decode(),)
+                    for record in iter_git_records(
+                        self.repo, ["rev-list", "--ignore-missing", "--stdin"], b"\n", revisions.encode()
+                    )
+                ),
+            )
+
+    def _index_batch(self, hexshas: list[str]) -> int:
+        """Index the commits in `hexshas` that are not stored yet, e.g. by an interrupted build"""
+        missing = [
+            hexsha for hexsha in hexshas
+            if self.conn.execute("SELECT 1 FROM commits WHERE hexsha = ?", (hexsha,)).fetchone() is None
+        ]
+        if not missing:
+            return 0
+
+        output = run_git(
+            self.repo, "log", "--no-walk=unsorted", "--stdin", f"--format={self.LOG_FORMAT}", "--name-only", "-z",
+            input="\n".join(missing).encode(),
+        )
+        added = 0
+        with self.conn:
+            for record in output.split("\x1e"):
+                if not record:
+                    continue
+                hexsha, author, email, authored_at, date, message, names = record.split("\x1f", 6)
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO commits "
+                    "(hexsha, author, author_email, authored_at, date, message) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (hexsha, author, email, int(authored_at), date, message),
+                )
+                if not cursor.rowcount:
+                    continue
+                commit_id = cursor.lastrowid
+                if self.fts:
+                    self.conn.execute(
+                        "INSERT INTO commit_text (rowid, message, author) VALUES (?, ?, ?)",
+                        (commit_id, message, f"{author} {email}"),
+                    )
+                self.conn.executemany(
+                    "INSERT INTO commit_paths (commit_id, path) VALUES (?, ?)",
+                    ((commit_id, name) for name in names.strip("\0\n").split("\0") if name),
+                )
+                added += 1
+        return added
+
+    def search(
+        self,
+        query: str | None = None,
+        author: str | None = None,
+        path: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        max_count: int = 20,
+    ) -> list[str]:
+        clauses = []
+        params: list[Any] = []
+        if self.fts and (query or author):
+            match = []
+            if query:
+                match.append(f"message : ({_fts_phrases(query)})")
+            if author:
+                match.append(f"author : ({_fts_phrases(author)})")
+            clauses.append("id IN (SELECT rowid FROM commit_text WHERE commit_text MATCH ?)")
+            params.append(" AND ".join(match))
+        else:
+            for term in (query or "").split():
+                clauses.append("message LIKE ?")
+                params.append(f"%{term}%")
+            if author:
+                clauses.append("(author LIKE ? OR author_email LIKE ?)")
+                params += [f"%{author}%"] * 2
+        if path:
+            directory = path.rstrip("/")
+            clauses.append(
+                "id IN (SELECT commit_id FROM commit_paths "
+                "WHERE path = ? OR (path >= ? AND path < ?))"
+            )
+            # Everything under `directory/` sorts between "directory/" and "directory0"
+            params += [directory, f"{directory}/", f"{directory}0"]
+        if since:
+            clauses.append("authored_at >= ?")
+            params.append(_to_timestamp(since))
+        if until:
+            clauses.append("authored_at <= ?")
+            params.append(_to_timestamp(until))
+        self._mark_unreachable()
+        clauses.append("hexsha NOT IN (SELECT hexsha FROM unreachable)")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            f"SELECT hexsha, author, date, message FROM commits {where} "
+            "ORDER BY authored_at DESC, id DESC LIMIT ?",
+            (*params, max_count),
+        ).fetchall()
+        return [
+            f"Commit: {hexsha}\n"
+            f"Author: {author_name}\n"
+            f"Date: {date}\n"
+            f"Message: {message}\n"
+            for hexsha, author_name, date, message in rows
+        ]
+
 class GitTools(str, Enum):
     STATUS = "git_status"
     DIFF_UNSTAGED = "git_diff_unstaged"
@@ -72,40 +854,210 @@ class GitTools(str, Enum):
     CHECKOUT = "git_checkout"
     SHOW = "git_show"
     INIT = "git_init"
+    SEARCH_COMMITS = "git_search_commits"
+    READ_FILE = "git_read_file"
+    BLAME = "git_blame"
+    STATUS_ALL = "git_status_all"
+    LOG_ALL = "git_log_all"
+    SEARCH_COMMITS_ALL = "git_search_commits_all"
+
+# Tools that write to the repository or read objects through GitPython's
+# shared `cat-file` processes; these are serialized per repository while
+# subprocess-backed read-only tools run concurrently.
+SERIALIZED_TOOLS = {
+    GitTools.COMMIT,
+    GitTools.ADD,
+    GitTools.RESET,
+    GitTools.CREATE_BRANCH,
+    GitTools.CHECKOUT,
+    GitTools.SEARCH_COMMITS,
+    GitTools.READ_FILE,
+}
+
+def git_status(
+    repo: git.Repo,
+    porcelain: bool = False,
+    untracked: bool = True,
+    max_entries: int | None = DEFAULT_MAX_STATUS_ENTRIES,
+) -> str:
+    untracked_files = "--untracked-files=normal" if untracked else "--untracked-files=no"
+    if not porcelain:
+        return run_git(repo, "status", untracked_files)
+    return git_status_porcelain(repo, untracked_files, max_entries)
+
+def git_status_porcelain(repo: git.Repo, untracked_files: str, max_entries: int | None) -> str:
+    """Summarize `git status --porcelain=v2 -z` as one `XY path` line per entry.
 
-def git_status(repo: git.Repo) -> str:
-    return repo.git.status()
+    The untracked cache is enabled for the invocation (an fsmonitor configured
+    for the repository is used by git itself), and git is stopped once
+    `max_entries` entries have been read.
+    """
+    args = [
+        "-c", "core.untrackedCache=true",
+        "status", "--porcelain=v2", "-z", "--branch", untracked_files,
+    ]
+    branch: dict[str, str] = {}
+    entries: list[str] = []
+    truncated = False
+    records = iter_git_records(repo, args, b"\0")
+    try:
+        for raw in records:
+            record = raw.decode("utf-8", errors="replace")
+            kind = record[:1]
+            if kind == "#":
+                key, _, value = record[2:].partition(" ")
+                branch[key] = value
+                continue
+            if max_entries is not None and len(entries) >= max_entries:
+                truncated = True
+                break
+            if kind == "1":
+                fields = record.split(" ", 8)
+                entries.append(f"{fields[1]} {fields[8]}")
+            elif kind == "2":
+                fields = record.split(" ", 9)
+                original = next(records).decode("utf-8", errors="replace")
+                entries.append(f"{fields[1]} {fields[9]} (from {original})")
+            elif kind == "u":
+                fields = record.split(" ", 10)
+                entries.append(f"{fields[1]} {fields[10]} (unmerged)")
+            elif kind == "?":
+                entries.append(f"?? {record[2:]}")
+            elif kind == "!":
+                entries.append(f"!! {record[2:]}")
+    finally:
+        records.close()
+
+    lines = [f"Branch: {branch.get('branch.head', '(unknown)')}"]
+    if "branch.upstream" in branch:
+        upstream = branch["branch.upstream"]
+        if "branch.ab" in branch:
+            upstream += f" ({branch['branch.ab']})"
+        lines.append(f"Upstream: {upstream}")
+    lines += entries or ["Working tree clean"]
+    if truncated:
+        lines.append(f"[Stopped after {max_entries} entries; more changes not shown]")
+    return "\n".join(lines)
+
+def git_diff_unstaged(
+    repo: git.Repo,
+    paths: list[str] | None = None,
+    summary: bool = False,
+    offset: int = 0,
+    max_bytes: int | None = DEFAULT_MAX_BYTES,
+) -> str:
+    return run_git_paged(repo, ["diff", *diff_args(paths, summary)], offset, max_bytes)
 
-def git_diff_unstaged(repo: git.Repo) -> str:
-    return repo.git.diff()
+def git_diff_staged(
+    repo: git.Repo,
+    paths: list[str] | None = None,
+    summary: bool = False,
+    offset: int = 0,
+    max_bytes: int | None = DEFAULT_MAX_BYTES,
+) -> str:
+    return run_git_paged(repo, ["diff", "--cached", *diff_args(paths, summary)], offset, max_bytes)
 
-def git_diff_staged(repo: git.Repo) -> str:
-    return repo.git.diff("--cached")
+WHITESPACE_OPTIONS = {
+    "all": "--ignore-all-space",
+    "change": "--ignore-space-change",
+    "at-eol": "--ignore-space-at-eol",
+    "blank-lines": "--ignore-blank-lines",
+}
 
-def git_diff(repo: git.Repo, target: str) -> str:
-    return repo.git.diff(target)
+def git_diff(
+    repo: git.Repo,
+    target: str,
+    paths: list[str] | None = None,
+    summary: bool = False,
+    offset: int = 0,
+    max_bytes: int | None = DEFAULT_MAX_BYTES,
+    renames: bool = True,
+    rename_limit: int | None = None,
+    find_copies: bool = False,
+    diff_algorithm: str | None = None,
+    ignore_whitespace: str | None = None,
+    time_budget: float | None = None,
+) -> str:
+    """Diff the working tree against `target`.
+
+    Rename and copy detection can go quadratic on large changesets. When
+    `time_budget` seconds pass without output, the diff is retried without
+    rename/copy detection and with the default algorithm, and the output says so.
+    """
+    config = ["-c", f"diff.renameLimit={rename_limit}"] if rename_limit is not None else []
+    options = [WHITESPACE_OPTIONS[ignore_whitespace]] if ignore_whitespace else []
+    cheap_options = [*options, "--no-renames"]
+    if diff_algorithm:
+        options.append(f"--diff-algorithm={diff_algorithm}")
+    options.append("--find-renames" if renames else "--no-renames")
+    if find_copies:
+        options.append("--find-copies")
+
+    args = ["diff", *options, target, *diff_args(paths, summary)]
+    try:
+        return run_git_paged(repo, [*config, *args], offset, max_bytes, time_budget)
+    except TimeoutError:
+        fallback = ["diff", *cheap_options, target, *diff_args(paths, summary)]
+        note = (
+            f"[Diff did not finish within {time_budget} seconds; "
+            "showing it without rename/copy detection and with the default algorithm]\n"
+        )
+        return note + run_git_paged(repo, fallback, offset, max_bytes)
 
 def git_commit(repo: git.Repo, message: str) -> str:
     commit = repo.index.commit(message)
     return f"Changes committed successfully with hash {commit.hexsha}"
 
 def git_add(repo: git.Repo, files: list[str]) -> str:
-    repo.index.add(files)
+    # Pathspecs go through stdin rather than argv, so globs work and tens of
+    # thousands of paths neither hit argv limits nor rewrite the index per path
+    pathspecs = b"".join(f"{file}\0".encode() for file in files)
+    run_git(repo, "add", "--pathspec-from-file=-", "--pathspec-file-nul", input=pathspecs)
     return "Files staged successfully"
 
 def git_reset(repo: git.Repo) -> str:
     repo.index.reset()
     return "All staged changes reset"
 
-def git_log(repo: git.Repo, max_count: int = 10) -> list[str]:
-    commits = list(repo.iter_commits(max_count=max_count))
+# Fields are separated by ASCII unit separators and commits by NUL (`-z`),
+# neither of which can appear in names, dates or hashes.
+LOG_FORMAT = "%H%x1f%an%x1f%ai%x1f%B"
+
+def git_log(
+    repo: git.Repo,
+    max_count: int = 10,
+    skip: int = 0,
+    author: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    paths: list[str] | None = None,
+) -> list[str]:
+    args = ["log", f"--format={LOG_FORMAT}", "-z", f"--max-count={max_count}"]
+    if skip:
+        args.append(f"--skip={skip}")
+    if author:
+        args.append(f"--author={author}")
+    if since:
+        args.append(f"--since={since}")
+    if until:
+        args.append(f"--until={until}")
+    if paths:
+        args += ["--", *paths]
+
+    return parse_log(run_git(repo, *args))
+
+def parse_log(output: str) -> list[str]:
+    """Format the output of `git log -z --format=LOG_FORMAT` as log entries"""
     log = []
-    for commit in commits:
+    for record in output.split("\0"):
+        if not record:
+            continue
+        hexsha, author_name, date, message = record.split("\x1f", 3)
         log.append(
-            f"Commit: {commit.hexsha}\n"
-            f"Author: {commit.author}\n"
-            f"Date: {commit.authored_datetime}\n"
-            f"Message: {commit.message}\n"
+            f"Commit: {hexsha}\n"
+            f"Author: {author_name}\n"
+            f"Date: {date}\n"
+            f"Message: {message}\n"
         )
     return log
 
@@ -119,7 +1071,7 @@ def git_create_branch(repo: git.Repo, branch_name: str, base_branch: str | None
     return f"Created branch '{branch_name}' from '{base.name}'"
 
 def git_checkout(repo: git.Repo, branch_name: str) -> str:
-    repo.git.checkout(branch_name)
+    run_git(repo, "checkout", branch_name)
     return f"Switched to branch '{branch_name}'"
 
 def git_init(repo_path: str) -> str:
@@ -129,30 +1081,156 @@ def git_init(repo_path: str) -> str:
     except Exception as e:
         return f"Error initializing repository: {str(e)}"
 
-def git_show(repo: git.Repo, revision: str) -> str:
-    commit = repo.commit(revision)
-    output = [
-        f"Commit: {commit.hexsha}\n"
-        f"Author: {commit.author}\n"
-        f"Date: {commit.authored_datetime}\n"
-        f"Message: {commit.message}\n"
+def count_changed_files(repo: git.Repo, revision: str, limit: int) -> int:
+    """Count the files `revision` changes against its first parent, stopping once `limit` is exceeded.
+
+    Only trees are compared, so this stays cheap for commits with huge patches.
+    """
+    args = [
+        "diff-tree", "-r", "--root", "--no-commit-id", "--name-only", "-z",
+        "-m", "--first-parent", revision,
     ]
-    if commit.parents:
-        parent = commit.parents[0]
-        diff = parent.diff(commit, create_patch=True)
-    else:
-        diff = commit.diff(git.NULL_TREE, create_patch=True)
-    for d in diff:
-        output.append(f"\n--- {d.a_path}\n+++ {d.b_path}\n")
-        output.append(d.diff.decode('utf-8'))
-    return "".join(output)
+    records = iter_git_records(repo, args, b"\0")
+    count = 0
+    try:
+        for _ in records:
+            count += 1
+            if count > limit:
+                break
+    finally:
+        records.close()
+    return count
+
+def git_show(
+    repo: git.Repo,
+    revision: str,
+    paths: list[str] | None = None,
+    summary: bool | None = None,
+    offset: int = 0,
+    max_bytes: int | None = DEFAULT_MAX_BYTES,
+) -> str:
+    """Show a commit and its diff against the first parent.
+
+    With `summary` unset, commits touching more than SHOW_PATCH_MAX_FILES
+    files are summarized with `--numstat` (binary files show `-` counts)
+    so that patches for individual files can be requested through `paths`.
+    """
+    note = ""
+    if summary is None:
+        summary = not paths and count_changed_files(repo, revision, SHOW_PATCH_MAX_FILES) > SHOW_PATCH_MAX_FILES
+        if summary:
+            note = (
+                f"\n[Commit changes more than {SHOW_PATCH_MAX_FILES} files, showing per-file line counts; "
+                "call again with `paths` for selected patches or summary=false for the full diff]"
+            )
+
+    args = [
+        "show",
+        "--format=Commit: %H%nAuthor: %an%nDate: %ai%nMessage: %B",
+        # Like `git diff <first parent> <commit>`, also for merges
+        "-m",
+        "--first-parent",
+        # Report binary files instead of running external diff or textconv drivers on them
+        "--no-ext-diff",
+        "--no-textconv",
+        revision,
+        *diff_args(paths, summary),
+    ]
+    return run_git_paged(repo, args, offset, max_bytes) + note
+
+def git_read_file(
+    repo: git.Repo,
+    revision: str,
+    path: str,
+    start_line: int | None = None,
+    end_line: int | None = None,
+    cache: BlobCache | None = None,
+) -> str:
+    """Read `path` as of `revision` through GitPython's persistent `cat-file --batch` processes"""
+    hexsha, object_type, size = repo.git.get_object_header(f"{revision}:{path}")
+    if object_type != b"blob":
+        raise ValueError(f"{path} is a {object_type.decode()} at {revision}, not a file")
 
-async def serve(repository: Path | None) -> None:
+    key = hexsha.decode()
+    data = cache.get(key) if cache is not None else None
+    if data is None:
+        data = repo.git.get_object_data(key)[3]
+        if cache is not None:
+            cache.put(key, data)
+
+    if b"\0" in data[:8000]:
+        return f"Binary file {path} at {revision} ({size} bytes)"
+
+    lines = data.decode("utf-8", errors="replace").splitlines(keepends=True)
+    start = max(start_line or 1, 1)
+    end = min(end_line or len(lines), len(lines))
+    text = "".join(lines[start - 1:end])
+    if len(text) > DEFAULT_MAX_BYTES:
+        text = text[:DEFAULT_MAX_BYTES]
+        text = text[:text.rfind("\n") + 1] or text
+        end = start + text.count("\n") - 1
+        return (
+            f"{text}[Output truncated at line {end} of {len(lines)}; "
+            f"call again with start_line={end + 1} to continue]"
+        )
+    return text
+
+def git_blame(
+    repo: git.Repo,
+    path: str,
+    revision: str | None = None,
+    start_line: int | None = None,
+    end_line: int | None = None,
+) -> str:
+    args = ["blame", "--date=short"]
+    if start_line or end_line:
+        args += ["-L", f"{start_line or 1},{end_line or ''}"]
+    if revision:
+        args.append(revision)
+    return run_git(repo, *args, "--", path)
+
+def git_search_commits(
+    repo: git.Repo,
+    query: str | None = None,
+    author: str | None = None,
+    path: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    max_count: int = 20,
+    use_index: bool = False,
+) -> list[str]:
+    if use_index:
+        with closing(CommitIndex(repo)) as index:
+            index.update()
+            return index.search(query, author, path, since, until, max_count)
+
+    args = ["log", f"--format={LOG_FORMAT}", "-z", f"--max-count={max_count}"]
+    if query:
+        args += ["--all-match", "--regexp-ignore-case", "--fixed-strings"]
+        args += [f"--grep={term}" for term in query.split()]
+    if author:
+        args.append(f"--author={author}")
+    if since:
+        args.append(f"--since={since}")
+    if until:
+        args.append(f"--until={until}")
+    if path:
+        args += ["--", path]
+    return parse_log(run_git(repo, *args))
+
+async def serve(
+    repository: Path | None,
+    timeout: float | None = None,
+    commit_index: bool = False,
+) -> None:
     logger = logging.getLogger(__name__)
+    repo_cache = RepoCache()
+    blob_cache = BlobCache()
+    executor = ThreadPoolExecutor(thread_name_prefix="mcp-git")
 
     if repository is not None:
         try:
-            git.Repo(repository)
+            repo_cache.get(repository)
             logger.info(f"Using repository at {repository}")
         except git.InvalidGitRepositoryError:
             logger.error(f"{repository} is not a valid Git repository")
@@ -165,22 +1243,30 @@ async def serve(repository: Path | None) -> None:
         return [
             Tool(
                 name=GitTools.STATUS,
-                description="Shows the working tree status",
+                description="Shows the working tree status. Set `porcelain` for a compact "
+                "`XY path` listing capped at `max_entries`, and `untracked` to false to skip "
+                "scanning for untracked files",
                 inputSchema=GitStatus.schema(),
             ),
             Tool(
                 name=GitTools.DIFF_UNSTAGED,
-                description="Shows changes in the working directory that are not yet staged",
+                description="Shows changes in the working directory that are not yet staged. "
+                "Output is paged by `max_bytes`/`offset`; use `summary` for per-file line counts "
+                "and `paths` to fetch patches for selected files",
                 inputSchema=GitDiffUnstaged.schema(),
             ),
             Tool(
                 name=GitTools.DIFF_STAGED,
-                description="Shows changes that are staged for commit",
+                description="Shows changes that are staged for commit. "
+                "Supports the same `paths`, `summary`, `offset` and `max_bytes` options as git_diff_unstaged",
                 inputSchema=GitDiffStaged.schema(),
             ),
             Tool(
                 name=GitTools.DIFF,
-                description="Shows differences between branches or commits",
+                description="Shows differences between branches or commits. "
+                "Supports the same `paths`, `summary`, `offset` and `max_bytes` options as git_diff_unstaged, "
+                "plus rename/copy detection, diff algorithm and whitespace controls. With `time_budget` "
+                "the diff falls back to cheaper settings when it takes longer than that many seconds",
                 inputSchema=GitDiff.schema(),
             ),
             Tool(
@@ -190,7 +1276,8 @@ async def serve(repository: Path | None) -> None:
             ),
             Tool(
                 name=GitTools.ADD,
-                description="Adds file contents to the staging area",
+                description="Adds file contents to the staging area. "
+                "`files` are git pathspecs, so globs such as `src/*.py` are accepted",
                 inputSchema=GitAdd.schema(),
             ),
             Tool(
@@ -200,7 +1287,8 @@ async def serve(repository: Path | None) -> None:
             ),
             Tool(
                 name=GitTools.LOG,
-                description="Shows the commit logs",
+                description="Shows the commit logs, optionally paged with `skip` and "
+                "filtered by `author`, `since`/`until` dates and `paths`",
                 inputSchema=GitLog.schema(),
             ),
             Tool(
@@ -215,36 +1303,96 @@ async def serve(repository: Path | None) -> None:
             ),
             Tool(
                 name=GitTools.SHOW,
-                description="Shows the contents of a commit",
+                description="Shows the contents of a commit. Commits touching many files are "
+                "summarized per file unless `summary` is false; supports the same `paths`, "
+                "`offset` and `max_bytes` options as git_diff_unstaged",
                 inputSchema=GitShow.schema(),
             ),
             Tool(
                 name=GitTools.INIT,
                 description="Initialize a new Git repository",
                 inputSchema=GitInit.schema(),
-            )
+            ),
+            Tool(
+                name=GitTools.READ_FILE,
+                description="Reads a file as of a revision, optionally limited to "
+                "the 1-based inclusive line range `start_line`..`end_line`",
+                inputSchema=GitReadFile.schema(),
+            ),
+            Tool(
+                name=GitTools.BLAME,
+                description="Shows the commit, author and date that last changed each line "
+                "of a file, optionally at `revision` and limited to `start_line`..`end_line`",
+                inputSchema=GitBlame.schema(),
+            ),
+            Tool(
+                name=GitTools.STATUS_ALL,
+                description="Shows the working tree status of every known repository "
+                "(or of `repo_paths`), queried concurrently",
+                inputSchema=GitStatusAll.schema(),
+            ),
+            Tool(
+                name=GitTools.LOG_ALL,
+                description="Shows the newest commits across every known repository "
+                "(or `repo_paths`), merged by date",
+                inputSchema=GitLogAll.schema(),
+            ),
+            Tool(
+                name=GitTools.SEARCH_COMMITS_ALL,
+                description="Runs git_search_commits in every known repository "
+                "(or `repo_paths`) and merges the matches by date",
+                inputSchema=GitSearchCommitsAll.schema(),
+            ),
+            Tool(
+                name=GitTools.SEARCH_COMMITS,
+                description="Finds commits whose message contains all words of `query`, "
+                "by `author`, touching a file or directory `path`, within ISO 8601 `since`/`until` dates",
+                inputSchema=GitSearchCommits.schema(),
+            ),
         ]
 
+    # Repositories found among each session's roots. Resolved once per
+    # session and dropped when the client reports that its roots changed.
+    session_repos: weakref.WeakKeyDictionary[ServerSession, list[str]] = weakref.WeakKeyDictionary()
+
+    async def handle_roots_list_changed(_: RootsListChangedNotification) -> None:
+        logger.debug("Roots changed, clearing cached root repositories")
+        session_repos.clear()
+
+    server.notification_handlers[RootsListChangedNotification] = handle_roots_list_changed
+
+    def resolve_repos(paths: Sequence[str]) -> list[str]:
+        repo_cache.ensure_capacity(len(paths))
+        repo_paths = []
+        for path in paths:
+            try:
+                repo_cache.get(path)
+                repo_paths.append(str(path))
+            except (git.InvalidGitRepositoryError, git.NoSuchPathError):
+                pass
+        return repo_paths
+
     async def list_repos() -> Sequence[str]:
         async def by_roots() -> Sequence[str]:
-            if not isinstance(server.request_context.session, ServerSession):
+            session = server.request_context.session
+            if not isinstance(session, ServerSession):
                 raise TypeError("server.request_context.session must be a ServerSession")
 
-            if not server.request_context.session.check_client_capability(
+            if session in session_repos:
+                return session_repos[session]
+
+            if not session.check_client_capability(
                 ClientCapabilities(roots=RootsCapability())
             ):
                 return []
 
-            roots_result: ListRootsResult = await server.request_context.session.list_roots()
+            roots_result: ListRootsResult = await session.list_roots()
             logger.debug(f"Roots result: {roots_result}")
-            repo_paths = []
-            for root in roots_result.roots:
-                path = root.uri.path
-                try:
-                    git.Repo(path)
-                    repo_paths.append(str(path))
-                except git.InvalidGitRepositoryError:
-                    pass
+            paths = [root.uri.path for root in roots_result.roots if root.uri.path]
+            repo_paths = await asyncio.get_running_loop().run_in_executor(
+                executor, resolve_repos, paths
+            )
+            session_repos[session] = repo_paths
             return repo_paths
 
         def by_commandline() -> Sequence[str]:
@@ -252,47 +1400,154 @@ async def serve(repository: Path | None) -> None:
 
         cmd_repos = by_commandline()
         root_repos = await by_roots()
-        return [*root_repos, *cmd_repos]
+        return list(dict.fromkeys([*root_repos, *cmd_repos]))
 
     @server.call_tool()
     async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+        if name in (GitTools.STATUS_ALL, GitTools.LOG_ALL, GitTools.SEARCH_COMMITS_ALL):
+            return await call_fan_out_tool(name, arguments)
+        result = await run_git_operation(executor, timeout, handle_tool, name, arguments)
+        if name == GitTools.INIT:
+            # A root that was skipped as "not a repository" may be one now
+            session_repos.clear()
+        return result
+
+    async def call_fan_out_tool(name: str, arguments: dict) -> list[TextContent]:
+        repo_paths = arguments.get("repo_paths") or await list_repos()
+        if not repo_paths:
+            raise ValueError(
+                "No known repositories; pass `repo_paths`, start the server with "
+                "--repository or expose repositories as roots"
+            )
+        # Keep every repository of the workspace open rather than cycling handles
+        repo_cache.ensure_capacity(len(repo_paths))
+
+        match name:
+            case GitTools.STATUS_ALL:
+                def status(repo_path: str) -> str:
+                    with repo_cache.use(repo_path) as repo:
+                        return git_status(
+                            repo,
+                            arguments.get("porcelain", True),
+                            arguments.get("untracked", True),
+                            arguments.get("max_entries", 100),
+                        )
+
+                results = await fan_out(executor, timeout, repo_paths, status)
+                sections = [
+                    f"Repository: {repo_path}\n"
+                    + (f"Error: {result}" if isinstance(result, Exception) else result)
+                    for repo_path, result in results
+                ]
+                return [TextContent(
+                    type="text",
+                    text="\n\n".join(sections)
+                )]
+
+            case GitTools.LOG_ALL:
+                max_count = arguments.get("max_count", 20)
+
+                def log(repo_path: str) -> list[str]:
+                    with repo_cache.use(repo_path) as repo:
+                        return git_log(
+                            repo,
+                            max_count,
+                            author=arguments.get("author"),
+                            since=arguments.get("since"),
+                            until=arguments.get("until"),
+                        )
+
+                results = await fan_out(executor, timeout, repo_paths, log)
+                return [TextContent(
+                    type="text",
+                    text="Commit history:\n" + "\n".join(merge_log_entries(results, max_count))
+                )]
+
+            case GitTools.SEARCH_COMMITS_ALL:
+                max_count = arguments.get("max_count", 20)
+
+                def search(repo_path: str) -> list[str]:
+                    with repo_cache.use(repo_path) as repo, repo_cache.lock_for(repo_path):
+                        return git_search_commits(
+                            repo,
+                            arguments.get("query"),
+                            arguments.get("author"),
+                            arguments.get("path"),
+                            arguments.get("since"),
+                            arguments.get("until"),
+                            max_count,
+                            use_index=commit_index,
+                        )
+
+                results = await fan_out(executor, timeout, repo_paths, search)
+                return [TextContent(
+                    type="text",
+                    text="Matching commits:\n" + "\n".join(merge_log_entries(results, max_count))
+                )]
+
+            case _:
+                raise ValueError(f"Unknown tool: {name}")
+
+    def handle_tool(name: str, arguments: dict) -> list[TextContent]:
         repo_path = Path(arguments["repo_path"])
-        
+
         # Handle git init separately since it doesn't require an existing repo
         if name == GitTools.INIT:
+            repo_cache.invalidate(repo_path)
             result = git_init(str(repo_path))
             return [TextContent(
                 type="text",
                 text=result
             )]
-            
+
         # For all other commands, we need an existing repo
-        repo = git.Repo(repo_path)
+        lock = repo_cache.lock_for(repo_path) if name in SERIALIZED_TOOLS else nullcontext()
+        with repo_cache.use(repo_path) as repo, lock:
+            operation = GitOperation.current()
+            if operation is not None:
+                operation.check()
+            return dispatch_tool(repo, name, arguments)
 
+    def dispatch_tool(repo: git.Repo, name: str, arguments: dict) -> list[TextContent]:
         match name:
             case GitTools.STATUS:
-                status = git_status(repo)
+                status = git_status(
+                    repo,
+                    arguments.get("porcelain", False),
+                    arguments.get("untracked", True),
+                    arguments.get("max_entries", DEFAULT_MAX_STATUS_ENTRIES),
+                )
                 return [TextContent(
                     type="text",
                     text=f"Repository status:\n{status}"
                 )]
 
             case GitTools.DIFF_UNSTAGED:
-                diff = git_diff_unstaged(repo)
+                diff = git_diff_unstaged(repo, **diff_options(arguments))
                 return [TextContent(
                     type="text",
                     text=f"Unstaged changes:\n{diff}"
                 )]
 
             case GitTools.DIFF_STAGED:
-                diff = git_diff_staged(repo)
+                diff = git_diff_staged(repo, **diff_options(arguments))
                 return [TextContent(
                     type="text",
                     text=f"Staged changes:\n{diff}"
                 )]
 
             case GitTools.DIFF:
-                diff = git_diff(repo, arguments["target"])
+                diff = git_diff(
+                    repo,
+                    arguments["target"],
+                    **diff_options(arguments),
+                    renames=arguments.get("renames", True),
+                    rename_limit=arguments.get("rename_limit"),
+                    find_copies=arguments.get("find_copies", False),
+                    diff_algorithm=arguments.get("diff_algorithm"),
+                    ignore_whitespace=arguments.get("ignore_whitespace"),
+                    time_budget=arguments.get("time_budget"),
+                )
                 return [TextContent(
                     type="text",
                     text=f"Diff with {arguments['target']}:\n{diff}"
@@ -320,7 +1575,15 @@ async def serve(repository: Path | None) -> None:
                 )]
 
             case GitTools.LOG:
-                log = git_log(repo, arguments.get("max_count", 10))
+                log = git_log(
+                    repo,
+                    arguments.get("max_count", 10),
+                    arguments.get("skip", 0),
+                    arguments.get("author"),
+                    arguments.get("since"),
+                    arguments.get("until"),
+                    arguments.get("paths"),
+                )
                 return [TextContent(
                     type="text",
                     text="Commit history:\n" + "\n".join(log)
@@ -345,7 +1608,50 @@ async def serve(repository: Path | None) -> None:
                 )]
 
             case GitTools.SHOW:
-                result = git_show(repo, arguments["revision"])
+                result = git_show(repo, arguments["revision"], **diff_options(arguments, summary=None))
+                return [TextContent(
+                    type="text",
+                    text=result
+                )]
+
+            case GitTools.SEARCH_COMMITS:
+                commits = git_search_commits(
+                    repo,
+                    arguments.get("query"),
+                    arguments.get("author"),
+                    arguments.get("path"),
+                    arguments.get("since"),
+                    arguments.get("until"),
+                    arguments.get("max_count", 20),
+                    use_index=commit_index,
+                )
+                return [TextContent(
+                    type="text",
+                    text="Matching commits:\n" + "\n".join(commits)
+                )]
+
+            case GitTools.READ_FILE:
+                result = git_read_file(
+                    repo,
+                    arguments["revision"],
+                    arguments["path"],
+                    arguments.get("start_line"),
+                    arguments.get("end_line"),
+                    cache=blob_cache,
+                )
+                return [TextContent(
+                    type="text",
+                    text=result
+                )]
+
+            case GitTools.BLAME:
+                result = git_blame(
+                    repo,
+                    arguments["path"],
+                    arguments.get("revision"),
+                    arguments.get("start_line"),
+                    arguments.get("end_line"),
+                )
                 return [TextContent(
                     type="text",
                     text=result
@@ -356,4 +1662,8 @@ async def serve(repository: Path | None) -> None:
 
     options = server.create_initialization_options()
     async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, options, raise_exceptions=True)
+        try:
+            await server.run(read_stream, write_stream, options, raise_exceptions=True)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            repo_cache.clear()
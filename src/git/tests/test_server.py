@@ -1,8 +1,38 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 import pytest
 from pathlib import Path
 import git
-from mcp_server_git.server import git_checkout
+import mcp_server_git
+from mcp import ClientSession, StdioServerParameters, types
+from mcp.client.stdio import stdio_client
+from mcp_server_git.server import (
+    BlobCache,
+    git_add,
+    git_blame,
+    git_checkout,
+    git_diff,
+    git_diff_unstaged,
+    git_log,
+    git_read_file,
+    git_search_commits,
+    git_show,
+    git_status,
+    CommitIndex,
+    GitOperation,
+    RepoCache,
+    fan_out,
+    merge_log_entries,
+    run_git_operation,
+)
 import shutil
+from contextlib import closing
 
 @pytest.fixture
 def test_repository(tmp_path: Path):
@@ -27,4 +57,526 @@ def test_git_checkout_existing_branch(test_repository):
 def test_git_checkout_nonexistent_branch(test_repository):
 
     with pytest.raises(git.GitCommandError):
-        git_checkout(test_repository, "nonexistent-branch")
\ No newline at end of file
+        git_checkout(test_repository, "nonexistent-branch")
+
+def test_git_add_globs_and_many_paths(test_repository):
+    repo_dir = Path(test_repository.working_dir)
+    (repo_dir / "generated").mkdir()
+    paths = [f"generated/file{i}.txt" for i in range(2000)]
+    for path in paths:
+        (repo_dir / path).write_text(path)
+    (repo_dir / "a.py").write_text("a")
+    (repo_dir / "b.py").write_text("b")
+
+    assert git_add(test_repository, paths) == "Files staged successfully"
+    assert git_add(test_repository, ["*.py"]) == "Files staged successfully"
+
+    staged = test_repository.git.diff("--cached", "--name-only").splitlines()
+    assert set(staged) == {*paths, "a.py", "b.py"}
+
+def test_git_add_unmatched_pathspec(test_repository):
+    with pytest.raises(git.GitCommandError):
+        git_add(test_repository, ["missing.txt"])
+
+def test_repo_cache_reuses_handles(test_repository):
+    cache = RepoCache()
+    repo_path = Path(test_repository.working_dir)
+
+    first = cache.get(repo_path)
+    assert cache.get(str(repo_path)) is first
+    assert len(cache) == 1
+
+def test_repo_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = RepoCache(maxsize=2)
+    paths = [tmp_path / name for name in ("a", "b", "c")]
+    for path in paths:
+        git.Repo.init(path)
+
+    first = cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+
+    assert len(cache) == 2
+    assert cache.get(paths[0]) is first
+
+def test_repo_cache_keeps_evicted_handles_open_while_in_use(tmp_path: Path):
+    cache = RepoCache(maxsize=1)
+    paths = [tmp_path / name for name in ("a", "b")]
+    for path in paths:
+        git.Repo.init(path)
+    closed = []
+
+    with cache.use(paths[0]) as repo:
+        repo.close = lambda: closed.append(repo)
+        cache.get(paths[1])
+        assert len(cache) == 1
+        assert closed == []
+    assert closed == [repo]
+
+def test_repo_cache_grows_to_fit_workspace(tmp_path: Path):
+    cache = RepoCache(maxsize=2)
+    cache.ensure_capacity(1)
+    assert cache.maxsize == 2
+
+    cache.ensure_capacity(3)
+    paths = [tmp_path / name for name in ("a", "b", "c")]
+    for path in paths:
+        git.Repo.init(path)
+    handles = [cache.get(path) for path in paths]
+    assert all(cache.get(path) is handle for path, handle in zip(paths, handles))
+    assert len(cache) == 3
+
+def test_repo_cache_opens_repositories_outside_the_lock(tmp_path: Path, monkeypatch):
+    cache = RepoCache()
+    cached, slow = tmp_path / "cached", tmp_path / "slow"
+    git.Repo.init(cached)
+    git.Repo.init(slow)
+    cache.get(cached)
+
+    opening = threading.Event()
+    release = threading.Event()
+    open_repo = git.Repo
+
+    def slow_open(path, *args, **kwargs):
+        if Path(path) == slow.resolve():
+            opening.set()
+            release.wait(5)
+        return open_repo(path, *args, **kwargs)
+
+    monkeypatch.setattr(git, "Repo", slow_open)
+    with ThreadPoolExecutor(2) as pool:
+        pending = pool.submit(cache.get, slow)
+        assert opening.wait(5)
+        # Cached handles are served while another repository is being opened
+        assert pool.submit(cache.get, cached).result(timeout=1) is not None
+        release.set()
+        assert pending.result(timeout=5) is cache.get(slow)
+    assert len(cache) == 2
+
+def test_repo_cache_drops_removed_repository(tmp_path: Path):
+    cache = RepoCache()
+    repo_path = tmp_path / "removed"
+    git.Repo.init(repo_path)
+    cache.get(repo_path)
+
+    shutil.rmtree(repo_path)
+
+    with pytest.raises(git.NoSuchPathError):
+        cache.get(repo_path)
+    assert len(cache) == 0
+
+
+def test_git_status_runs_outside_operation(test_repository):
+    Path(test_repository.working_dir, "new.txt").write_text("new")
+
+    assert "new.txt" in git_status(test_repository)
+
+def test_git_status_porcelain(test_repository):
+    repo_dir = Path(test_repository.working_dir)
+    test_repository.git.mv("test.txt", "renamed file.txt")
+    (repo_dir / "untracked.txt").write_text("new")
+
+    status = git_status(test_repository, porcelain=True)
+    assert status.splitlines() == [
+        f"Branch: {test_repository.active_branch.name}",
+        "R. renamed file.txt (from test.txt)",
+        "?? untracked.txt",
+    ]
+
+    status = git_status(test_repository, porcelain=True, untracked=False)
+    assert "untracked.txt" not in status
+
+def test_git_status_porcelain_caps_entries(test_repository):
+    for i in range(10):
+        Path(test_repository.working_dir, f"new{i}.txt").write_text(str(i))
+
+    status = git_status(test_repository, porcelain=True, max_entries=3)
+    lines = status.splitlines()
+    assert len([line for line in lines if line.startswith("?? ")]) == 3
+    assert lines[-1] == "[Stopped after 3 entries; more changes not shown]"
+
+def test_run_git_operation_runs_handler_in_worker(test_repository):
+    result = asyncio.run(run_git_operation(None, 10, git_status, test_repository))
+
+    assert "nothing to commit" in result
+
+@asynccontextmanager
+async def server_session(*args: str, **session_options):
+    """A client session with the server started over stdio with `args`"""
+    src = str(Path(mcp_server_git.__file__).parent.parent)
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "mcp_server_git", *args],
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [src, os.environ.get("PYTHONPATH")]))},
+    )
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write, **session_options) as session:
+            await session.initialize()
+            yield session
+
+def test_server_runs_tool_calls_concurrently(test_repository, tmp_path: Path):
+    # An fsmonitor hook that sleeps makes every `git status` slow and logs when it ran
+    log = tmp_path / "hook.log"
+    hook = tmp_path / "fsmonitor-hook"
+    hook.write_text(f"#!/bin/sh\necho \"start $(date +%s.%N)\" >> {log}\nsleep 0.5\necho \"end $(date +%s.%N)\" >> {log}\nexit 1\n")
+    hook.chmod(0o755)
+    test_repository.git.config("core.fsmonitor", str(hook))
+
+    async def call_twice():
+        async with server_session("--repository", test_repository.working_dir) as session:
+            arguments = {"repo_path": test_repository.working_dir}
+            return await asyncio.gather(
+                session.call_tool("git_status", arguments),
+                session.call_tool("git_status", arguments),
+            )
+
+    results = asyncio.run(call_twice())
+    assert all(not result.isError for result in results)
+
+    starts, ends = [], []
+    for line in log.read_text().splitlines():
+        event, stamp = line.split()
+        (starts if event == "start" else ends).append(float(stamp))
+    # Handled one at a time, every hook run would finish before the next one starts
+    starts, ends = sorted(starts), sorted(ends)
+    assert any(start < end for start, end in zip(starts[1:], ends))
+
+def test_server_rescans_roots_after_git_init(test_repository, tmp_path: Path):
+    project = tmp_path / "project"
+    project.mkdir()
+    roots = [Path(test_repository.working_dir), project]
+    root_requests = []
+
+    async def list_roots(context) -> types.ListRootsResult:
+        root_requests.append(context)
+        return types.ListRootsResult(roots=[types.Root(uri=root.as_uri()) for root in roots])
+
+    async def status_all_before_and_after_init():
+        async with server_session(list_roots_callback=list_roots) as session:
+            before = await session.call_tool("git_status_all", {})
+            cached = await session.call_tool("git_status_all", {})
+            await session.call_tool("git_init", {"repo_path": str(project)})
+            after = await session.call_tool("git_status_all", {})
+            return before, cached, after
+
+    before, cached, after = asyncio.run(status_all_before_and_after_init())
+
+    def repositories(result) -> list[str]:
+        return [line for line in result.content[0].text.splitlines() if line.startswith("Repository: ")]
+
+    # Roots are resolved once per session, and again after git_init
+    assert len(root_requests) == 2
+    assert repositories(before) == repositories(cached) == [f"Repository: {test_repository.working_dir}"]
+    assert repositories(after) == [f"Repository: {test_repository.working_dir}", f"Repository: {project}"]
+
+def test_run_git_operation_timeout_kills_subprocess():
+    processes: list[subprocess.Popen] = []
+
+    def slow_handler() -> None:
+        operation = GitOperation.current()
+        assert operation is not None
+        process = operation.popen(["sleep", "30"])
+        processes.append(process)
+        process.wait()
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        asyncio.run(run_git_operation(None, 0.2, slow_handler))
+
+    assert time.monotonic() - started < 10
+    assert processes[0].wait(timeout=5) != 0
+
+
+def test_git_diff_unstaged_pages_reassemble(test_repository):
+    Path(test_repository.working_dir, "test.txt").write_text(
+        "".join(f"line {i}\n" for i in range(200))
+    )
+    full = git_diff_unstaged(test_repository, max_bytes=None)
+
+    pages = []
+    offset = 0
+    while True:
+        page = git_diff_unstaged(test_repository, offset=offset, max_bytes=500)
+        body, marker, rest = page.partition("\n[Output truncated; call again with offset=")
+        pages.append(body)
+        if not marker:
+            break
+        offset = int(rest.split(" ")[0])
+
+    assert len(pages) > 1
+    assert "".join(pages) == full
+
+def test_git_diff_unstaged_summary_and_paths(test_repository):
+    Path(test_repository.working_dir, "test.txt").write_text("changed\n")
+    Path(test_repository.working_dir, "other.txt").write_text("other\n")
+    test_repository.index.add(["other.txt"])
+    test_repository.index.commit("add other")
+    Path(test_repository.working_dir, "other.txt").write_text("other changed\n")
+
+    summary = git_diff_unstaged(test_repository, summary=True)
+    assert summary.splitlines() == ["1\t1\tother.txt", "1\t1\ttest.txt"]
+
+    patch = git_diff_unstaged(test_repository, paths=["other.txt"])
+    assert "+other changed" in patch
+    assert "test.txt" not in patch
+
+def test_git_diff_rename_and_whitespace_options(test_repository):
+    repo_dir = Path(test_repository.working_dir)
+    (repo_dir / "test.txt").write_text("one two\nthree\nfour\nfive\n")
+    test_repository.index.add(["test.txt"])
+    test_repository.index.commit("more lines")
+    test_repository.git.mv("test.txt", "moved.txt")
+    (repo_dir / "moved.txt").write_text("one  two\nthree\nfour\nfive\n")
+
+    assert "rename from test.txt" in git_diff(test_repository, "HEAD")
+    assert "rename from" not in git_diff(test_repository, "HEAD", renames=False)
+    assert "one  two" not in git_diff(test_repository, "HEAD", ignore_whitespace="change")
+    assert "+one  two" in git_diff(test_repository, "HEAD", diff_algorithm="histogram")
+
+def test_git_diff_time_budget_falls_back(test_repository, tmp_path: Path):
+    test_repository.git.mv("test.txt", "moved.txt")
+    # A slow fsmonitor hook holds back the diff's first output well past the budget
+    hook = tmp_path / "fsmonitor-hook"
+    hook.write_text("#!/bin/sh\nsleep 0.5\nexit 1\n")
+    hook.chmod(0o755)
+    test_repository.git.config("core.fsmonitor", str(hook))
+
+    diff = git_diff(test_repository, "HEAD", time_budget=0.1)
+    assert diff.startswith("[Diff did not finish within 0.1 seconds;")
+    assert "rename from" not in diff
+    assert "deleted file mode" in diff
+
+def test_git_show_includes_header_and_patch(test_repository):
+    result = git_show(test_repository, "HEAD")
+
+    assert result.startswith(f"Commit: {test_repository.head.commit.hexsha}\n")
+    assert "Message: initial commit" in result
+    assert "+test" in result
+
+
+def test_git_show_summarizes_large_commits(test_repository):
+    repo_dir = Path(test_repository.working_dir)
+    paths = [f"file{i:03}.txt" for i in range(60)]
+    for path in paths:
+        (repo_dir / path).write_text(path)
+    (repo_dir / "blob.bin").write_bytes(b"\0\1\2")
+    test_repository.index.add([*paths, "blob.bin"])
+    test_repository.index.commit("large commit")
+
+    summary = git_show(test_repository, "HEAD")
+    assert "Commit changes more than 50 files" in summary
+    assert "-\t-\tblob.bin" in summary
+    assert "1\t0\tfile000.txt" in summary
+    assert "+file000.txt" not in summary
+
+    patch = git_show(test_repository, "HEAD", paths=["file000.txt", "blob.bin"])
+    assert "+file000.txt" in patch
+    assert "Binary files /dev/null and b/blob.bin differ" in patch
+    assert "file001.txt" not in patch
+
+    full = git_show(test_repository, "HEAD", summary=False)
+    assert "+file059.txt" in full
+
+def test_git_log_paging_and_filters(test_repository):
+    for i in range(5):
+        Path(test_repository.working_dir, f"file{i}.txt").write_text(str(i))
+        test_repository.index.add([f"file{i}.txt"])
+        author = git.Actor("Alice" if i % 2 else "Bob", "dev@example.com")
+        test_repository.index.commit(f"commit {i}", author=author)
+
+    log = git_log(test_repository, max_count=2, skip=1)
+    assert [entry.splitlines()[3] for entry in log] == ["Message: commit 3", "Message: commit 2"]
+
+    log = git_log(test_repository, max_count=10, author="Alice")
+    assert [entry.splitlines()[3] for entry in log] == ["Message: commit 3", "Message: commit 1"]
+
+    log = git_log(test_repository, paths=["file2.txt"])
+    assert len(log) == 1
+    assert log[0].startswith("Commit: ")
+    assert "Author: Bob\n" in log[0]
+    assert "Message: commit 2\n" in log[0]
+
+    assert git_log(test_repository, until="2000-01-01") == []
+
+
+@pytest.fixture
+def history_repository(test_repository):
+    changes = [
+        ("src/app/main.py", "Add main entry point", "Alice"),
+        ("src/app/cache.py", "Introduce result caching", "Bob"),
+        ("docs/readme.md", "Document cache settings", "Alice"),
+    ]
+    for path, message, author in changes:
+        file_path = Path(test_repository.working_dir, path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(message)
+        test_repository.index.add([path])
+        test_repository.index.commit(message, author=git.Actor(author, f"{author.lower()}@example.com"))
+    return test_repository
+
+def _messages(entries: list[str]) -> list[str]:
+    return [entry.splitlines()[3].removeprefix("Message: ") for entry in entries]
+
+@pytest.mark.parametrize("use_index", [True, False])
+def test_git_search_commits(history_repository, use_index):
+    def search(**kwargs):
+        return _messages(git_search_commits(history_repository, use_index=use_index, **kwargs))
+
+    assert search(query="cach") == ["Document cache settings", "Introduce result caching"]
+    assert search(query="cache", author="Alice") == ["Document cache settings"]
+    assert search(path="src/app") == ["Introduce result caching", "Add main entry point"]
+    assert search(path="src/app/main.py") == ["Add main entry point"]
+    assert search(max_count=1) == ["Document cache settings"]
+
+def test_commit_index_updates_incrementally(history_repository):
+    with closing(CommitIndex(history_repository)) as index:
+        assert index.update() == 4
+        assert index.update() == 0
+
+        Path(history_repository.working_dir, "later.txt").write_text("later")
+        history_repository.index.add(["later.txt"])
+        history_repository.index.commit("Later change")
+        assert index.update() == 1
+
+        # Moving HEAD back indexes nothing; commits it cannot reach are not found
+        history_repository.git.reset("--hard", "HEAD~2")
+        assert index.update() == 0
+        assert _messages(index.search(query="later")) == []
+        assert _messages(index.search(query="cach")) == ["Introduce result caching"]
+
+        history_repository.git.reset("--hard", "ORIG_HEAD")
+        assert index.update() == 0
+        assert _messages(index.search(query="later")) == ["Later change"]
+
+
+def test_commit_index_only_indexes_new_commits_after_rewrites(history_repository):
+    repo = history_repository
+    with closing(CommitIndex(repo)) as index:
+        assert index.update() == 4
+
+        repo.git.config("user.name", "Alice")
+        repo.git.config("user.email", "alice@example.com")
+        repo.git.commit("--amend", "-m", "Document cache settings properly")
+        assert index.update() == 1
+        assert _messages(index.search(query="document")) == ["Document cache settings properly"]
+
+        main = repo.active_branch.name
+        repo.git.checkout("-b", "feature", "HEAD~2")
+        Path(repo.working_dir, "feature.txt").write_text("feature")
+        repo.index.add(["feature.txt"])
+        repo.index.commit("Feature work")
+        assert index.update() == 1
+        assert _messages(index.search(query="document")) == []
+        assert _messages(index.search(query="feature")) == ["Feature work"]
+
+        repo.git.checkout(main)
+        assert index.update() == 0
+        assert _messages(index.search(query="feature")) == []
+        assert _messages(index.search(query="document")) == ["Document cache settings properly"]
+
+
+def test_commit_index_resumes_interrupted_build(history_repository, monkeypatch):
+    monkeypatch.setattr(mcp_server_git.server, "COMMIT_INDEX_BATCH_SIZE", 1)
+    index_batch = CommitIndex._index_batch
+    batches = []
+
+    def interrupt_third_batch(self, hexshas):
+        batches.append(hexshas)
+        if len(batches) == 3:
+            raise TimeoutError
+        return index_batch(self, hexshas)
+
+    with closing(CommitIndex(history_repository)) as index:
+        monkeypatch.setattr(CommitIndex, "_index_batch", interrupt_third_batch)
+        with pytest.raises(TimeoutError):
+            index.update()
+        monkeypatch.setattr(CommitIndex, "_index_batch", index_batch)
+
+    # The two finished batches were kept, so only the rest is indexed
+    with closing(CommitIndex(history_repository)) as index:
+        assert index.update() == 2
+        assert index.update() == 0
+        assert _messages(index.search(query="cach")) == ["Document cache settings", "Introduce result caching"]
+
+
+def test_git_read_file_line_range_and_cache(test_repository):
+    repo_dir = Path(test_repository.working_dir)
+    (repo_dir / "lines.txt").write_text("".join(f"line {i}\n" for i in range(1, 21)))
+    test_repository.index.add(["lines.txt"])
+    test_repository.index.commit("add lines")
+    (repo_dir / "lines.txt").write_text("rewritten\n")
+
+    cache = BlobCache()
+    assert git_read_file(test_repository, "HEAD", "lines.txt", 3, 4, cache=cache) == "line 3\nline 4\n"
+    assert len(cache) == 1
+    assert git_read_file(test_repository, "HEAD", "lines.txt", 19, cache=cache) == "line 19\nline 20\n"
+    assert len(cache) == 1
+    assert git_read_file(test_repository, "HEAD~1", "test.txt") == "test"
+
+    with pytest.raises(ValueError):
+        git_read_file(test_repository, "HEAD", "missing.txt")
+
+def test_git_read_file_binary(test_repository):
+    Path(test_repository.working_dir, "image.bin").write_bytes(b"\x89PNG\0\0\x01")
+    test_repository.index.add(["image.bin"])
+    test_repository.index.commit("add binary")
+
+    assert git_read_file(test_repository, "HEAD", "image.bin") == "Binary file image.bin at HEAD (7 bytes)"
+
+def test_blob_cache_evicts_by_size():
+    cache = BlobCache(max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")
+    cache.put("c", b"123")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"12345"
+    assert cache.size == 8
+
+def test_git_blame_line_range(test_repository):
+    repo_dir = Path(test_repository.working_dir)
+    (repo_dir / "test.txt").write_text("first\nsecond\nthird\n")
+    test_repository.index.add(["test.txt"])
+    commit = test_repository.index.commit("three lines", author=git.Actor("Blamed", "b@example.com"))
+
+    blame = git_blame(test_repository, "test.txt", start_line=2, end_line=3).splitlines()
+    assert len(blame) == 2
+    assert blame[0].startswith(commit.hexsha[:7])
+    assert "Blamed" in blame[0]
+    assert blame[1].endswith(") third")
+
+
+def test_fan_out_runs_concurrently_and_keeps_errors():
+    def slow(repo_path: str) -> str:
+        if repo_path == "broken":
+            raise ValueError("not a repository")
+        time.sleep(0.2)
+        return repo_path.upper()
+
+    started = time.monotonic()
+    results = asyncio.run(fan_out(None, 10, ["a", "b", "broken", "c"], slow, max_parallel=4))
+
+    assert time.monotonic() - started < 0.6
+    assert [path for path, _ in results] == ["a", "b", "broken", "c"]
+    assert results[0][1] == "A"
+    assert isinstance(results[2][1], ValueError)
+
+def test_merge_log_entries_orders_by_date(tmp_path: Path):
+    repos = []
+    for name, dates in (("one", ["2024-01-01T10:00:00", "2024-01-03T10:00:00"]), ("two", ["2024-01-02T10:00:00"])):
+        repo = git.Repo.init(tmp_path / name)
+        for date in dates:
+            repo.index.commit(f"{name} {date}", author_date=date, commit_date=date)
+        repos.append(repo)
+
+    results = [(repo.working_dir, git_log(repo)) for repo in repos]
+    results.append(("missing", ValueError("boom")))
+    merged = merge_log_entries(results, max_count=2)
+
+    assert [entry.splitlines()[4] for entry in merged[:2]] == [
+        "Message: one 2024-01-03T10:00:00",
+        "Message: two 2024-01-02T10:00:00",
+    ]
+    assert merged[2] == "Repository: missing\nError: boom\n"
@@ -0,0 +1,321 @@
+"""End-to-end latency benchmarks for mcp-server-sqlite.
+
+Generates a database of configurable size and schema, starts the server over
+stdio and times every tool through an MCP client session, so the numbers
+include protocol, dispatch, threading and SQLite costs. Peak RSS of the server
+process is recorded once it exits.
+
+    uv run python benchmarks/benchmark_server.py --rows 200000 --output results.json
+    uv run python benchmarks/benchmark_server.py --compare results.json
+    uv run python benchmarks/benchmark_server.py --server-arg=--result-cache-size=0
+
+Results are written as JSON and can be compared against an earlier run to spot
+regressions.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+REGIONS = ["north", "south", "east", "west", "central"]
+STATUSES = ["pending", "paid", "shipped", "refunded"]
+WORDS = "cache index parser server client config request response buffer stream".split()
+
+
+@dataclass
+class DatabaseSpec:
+    customers: int
+    orders: int
+    extra_tables: int
+    extra_columns: int
+    seed: int
+
+
+def generate_database(path: Path, spec: DatabaseSpec) -> None:
+    """Create `customers` and `orders` tables plus `spec.extra_tables` wide tables for schema tools"""
+    rng = random.Random(spec.seed)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = wal")
+    conn.executescript(
+        """
+        CREATE TABLE customers (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            region TEXT NOT NULL,
+            created TEXT NOT NULL
+        );
+        CREATE TABLE orders (
+            id INTEGER PRIMARY KEY,
+            customer_id INTEGER NOT NULL REFERENCES customers(id),
+            total REAL NOT NULL,
+            status TEXT NOT NULL,
+            note TEXT,
+            created TEXT NOT NULL
+        );
+        CREATE INDEX idx_orders_customer_id ON orders(customer_id);
+        """
+    )
+    conn.executemany(
+        "INSERT INTO customers VALUES (?, ?, ?, ?)",
+        (
+            (i, f"Customer {i}", rng.choice(REGIONS), f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+            for i in range(1, spec.customers + 1)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO orders VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (
+                i,
+                rng.randint(1, spec.customers),
+                round(rng.uniform(1, 500), 2),
+                rng.choice(STATUSES),
+                " ".join(rng.choice(WORDS) for _ in range(6)),
+                f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            )
+            for i in range(1, spec.orders + 1)
+        ),
+    )
+    for table in range(spec.extra_tables):
+        columns = ", ".join(f"c{column} TEXT" for column in range(spec.extra_columns))
+        conn.execute(f"CREATE TABLE extra_{table} (id INTEGER PRIMARY KEY, parent_id INTEGER REFERENCES customers(id), {columns})")
+        conn.execute(f"CREATE INDEX idx_extra_{table}_parent ON extra_{table}(parent_id)")
+    conn.commit()
+    conn.close()
+
+
+def write_import_file(path: Path, rows: int, seed: int) -> None:
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write("id,customer_id,total,status\n")
+        for i in range(rows):
+            f.write(f"{i},{rng.randint(1, 1000)},{rng.uniform(1, 500):.2f},{rng.choice(STATUSES)}\n")
+
+
+Operation = tuple[str, str, Callable[[int], dict[str, Any]]]
+
+
+def operations(spec: DatabaseSpec, scratch: Path, bulk_rows: int) -> list[Operation]:
+    """(label, tool, arguments for iteration i) for every tool; read-only tools first"""
+    rng = random.Random(spec.seed)
+    bulk = [[f"Bulk {i}", rng.choice(REGIONS), "2025-01-01"] for i in range(bulk_rows)]
+    import_file = scratch / "import.csv"
+    write_import_file(import_file, bulk_rows, spec.seed)
+
+    def query(sql: str, **kwargs: Any) -> Callable[[int], dict[str, Any]]:
+        return lambda _: {"query": sql, **kwargs}
+
+    def uncached(sql: str, **kwargs: Any) -> Callable[[int], dict[str, Any]]:
+        # A literal that changes every iteration defeats the server's result cache
+        return lambda i: {"query": f"{sql} AND {i} = {i}", **kwargs}
+
+    aggregate = "SELECT status, count(*) AS n, sum(total) AS revenue FROM orders WHERE 1 = 1"
+    return [
+        ("list_tables", "list_tables", lambda _: {}),
+        ("describe_table", "describe_table", lambda _: {"table_name": "orders"}),
+        ("describe_schema", "describe_schema", lambda _: {}),
+        ("explain_query", "explain_query", query("SELECT * FROM orders WHERE status = 'paid' ORDER BY created")),
+        ("read_point", "read_query", lambda i: {"query": f"SELECT * FROM orders WHERE id = {i % spec.orders + 1}"}),
+        ("read_join", "read_query", uncached(
+            "SELECT c.region, count(*) AS n FROM orders o JOIN customers c ON c.id = o.customer_id WHERE 1 = 1"
+        )),
+        ("read_aggregate_cached", "read_query", query(f"{aggregate} GROUP BY status")),
+        ("read_aggregate_uncached", "read_query", uncached(aggregate)),
+        ("read_page_objects", "read_query", uncached("SELECT * FROM orders WHERE 1 = 1")),
+        ("read_page_json", "read_query", uncached("SELECT * FROM orders WHERE 1 = 1", format="json")),
+        ("read_page_csv", "read_query", uncached("SELECT * FROM orders WHERE 1 = 1", format="csv")),
+        ("read_page_offset", "read_query", uncached(
+            "SELECT * FROM orders WHERE 1 = 1", offset=spec.orders // 2, max_rows=100
+        )),
+        ("export_query", "export_query", lambda i: {
+            "query": "SELECT * FROM orders WHERE total > 250",
+            "path": str(scratch / f"export-{i}.csv"),
+        }),
+        ("write_insert", "write_query", lambda i: {
+            "query": f"INSERT INTO customers (name, region, created) VALUES ('Bench {i}', 'north', '2025-01-01')"
+        }),
+        ("write_update", "write_query", lambda i: {
+            "query": f"UPDATE orders SET status = 'shipped' WHERE id = {i % spec.orders + 1}"
+        }),
+        ("bulk_insert", "bulk_insert", lambda _: {
+            "table_name": "customers",
+            "columns": ["name", "region", "created"],
+            "rows": bulk,
+        }),
+        ("import_file", "import_file", lambda i: {"path": str(import_file), "table_name": f"imported_{i}"}),
+    ]
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    ordered = sorted(timings)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, round(p * (len(ordered) - 1)))]
+
+    return {
+        "min_ms": round(ordered[0] * 1000, 3),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(percentile(0.95) * 1000, 3),
+        "p99_ms": round(percentile(0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def peak_child_rss_kib() -> int:
+    """Largest resident set of any child process that has exited, in KiB"""
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+async def run_benchmarks(
+    db_path: Path,
+    spec: DatabaseSpec,
+    iterations: int,
+    concurrency: int,
+    bulk_rows: int,
+    server_args: list[str],
+) -> dict[str, Any]:
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "mcp_server_sqlite", "--db-path", str(db_path), *server_args],
+        env=dict(os.environ),
+    )
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        async with stdio_client(params) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                for label, tool, arguments in operations(spec, Path(scratch), bulk_rows):
+                    timings = []
+                    errors = []
+                    for i in range(iterations):
+                        start = time.perf_counter()
+                        result = await session.call_tool(tool, arguments(i))
+                        timings.append(time.perf_counter() - start)
+                        text = result.content[0].text if result.content else ""
+                        if result.isError or text.startswith(("Error:", "Database error:")):
+                            errors.append(text)
+                    results[label] = {"tool": tool, "iterations": iterations, **summarize(timings)}
+                    if errors:
+                        results[label]["errors"] = errors[:3]
+                    print(f"{label:32} {results[label]['median_ms']:>10.1f} ms", file=sys.stderr)
+
+                # Concurrent reads are dispatched in parallel and spread over the reader pool
+                timings = []
+                for i in range(iterations):
+                    start = time.perf_counter()
+                    await asyncio.gather(*(
+                        session.call_tool("read_query", {
+                            "query": f"SELECT customer_id, sum(total) FROM orders WHERE {i} + {n} > 0 "
+                            "GROUP BY customer_id",
+                            "max_rows": 10,
+                        })
+                        for n in range(concurrency)
+                    ))
+                    timings.append(time.perf_counter() - start)
+                label = f"read_concurrent_{concurrency}"
+                results[label] = {"tool": "read_query", "iterations": iterations, **summarize(timings)}
+                print(f"{label:32} {results[label]['median_ms']:>10.1f} ms", file=sys.stderr)
+    return results
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> None:
+    print(f"{'operation':32} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for label, result in current["results"].items():
+        before = baseline["results"].get(label)
+        if before is None:
+            print(f"{label:32} {'-':>12} {result['median_ms']:>10.1f}ms {'new':>8}")
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        flag = "  <-- slower" if ratio > 1.2 else ""
+        print(f"{label:32} {before['median_ms']:>10.1f}ms {result['median_ms']:>10.1f}ms {ratio:>7.2f}x{flag}")
+    before_rss = baseline["metadata"].get("peak_rss_kib")
+    after_rss = current["metadata"]["peak_rss_kib"]
+    if before_rss:
+        print(f"{'peak_rss':32} {before_rss / 1024:>10.1f}MB {after_rss / 1024:>10.1f}MB {after_rss / before_rss:>7.2f}x")
+
+
+def main() -> None:
+    """Benchmark every mcp-server-sqlite tool against a generated database"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--customers', type=int, default=10_000, help='Rows in customers (default: %(default)s)')
+    parser.add_argument('--rows', type=int, default=200_000, help='Rows in orders (default: %(default)s)')
+    parser.add_argument('--extra-tables', type=int, default=100,
+                        help='Additional tables for the schema tools (default: %(default)s)')
+    parser.add_argument('--extra-columns', type=int, default=12,
+                        help='Columns per additional table (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--iterations', type=int, default=20, help='Calls per operation (default: %(default)s)')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='Simultaneous read_query calls in the concurrent read test (default: %(default)s)')
+    parser.add_argument('--bulk-rows', type=int, default=10_000,
+                        help='Rows per bulk_insert and import_file call (default: %(default)s)')
+    parser.add_argument('--db', type=Path, help='Reuse (or create) the generated database at this path')
+    parser.add_argument('--server-arg', action='append', default=[],
+                        help='Extra argument for the server, e.g. --server-arg=--readers=8 (repeatable)')
+    parser.add_argument('--output', type=Path, help='Write results as JSON to this file')
+    parser.add_argument('--compare', dest='baseline', type=Path, help='Compare results against an earlier JSON output')
+    args = parser.parse_args()
+
+    spec = DatabaseSpec(args.customers, args.rows, args.extra_tables, args.extra_columns, args.seed)
+    workdir = None
+    db_path = args.db
+    if db_path is None:
+        workdir = Path(tempfile.mkdtemp(prefix="mcp-sqlite-bench-"))
+        db_path = workdir / "bench.db"
+    try:
+        if not db_path.exists():
+            print(f"Generating database at {db_path}", file=sys.stderr)
+            start = time.perf_counter()
+            generate_database(db_path, spec)
+            print(f"Generated in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+        results = asyncio.run(run_benchmarks(
+            db_path, spec, args.iterations, args.concurrency, args.bulk_rows, args.server_arg
+        ))
+    finally:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "metadata": {
+            "database": asdict(spec),
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "bulk_rows": args.bulk_rows,
+            "server_args": args.server_arg,
+            "peak_rss_kib": peak_child_rss_kib(),
+            "sqlite": sqlite3.sqlite_version,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.baseline is not None:
+        compare(json.loads(args.baseline.read_text()), report)
+    elif args.output is None:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
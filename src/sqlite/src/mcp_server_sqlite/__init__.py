@@ -9,9 +9,74 @@ def main():
     parser.add_argument('--db-path', 
                        default="./sqlite_mcp_server.db",
                        help='Path to SQLite database file')
+    parser.add_argument('--journal-mode',
+                       choices=['delete', 'truncate', 'persist', 'memory', 'wal', 'off'],
+                       default=server.DEFAULT_PRAGMAS['journal_mode'],
+                       help='PRAGMA journal_mode (default: %(default)s)')
+    parser.add_argument('--synchronous',
+                       choices=['off', 'normal', 'full', 'extra'],
+                       default=server.DEFAULT_PRAGMAS['synchronous'],
+                       help='PRAGMA synchronous (default: %(default)s)')
+    parser.add_argument('--cache-size',
+                       type=int,
+                       default=server.DEFAULT_PRAGMAS['cache_size'],
+                       help='PRAGMA cache_size, in pages or negative KiB (default: %(default)s)')
+    parser.add_argument('--mmap-size',
+                       type=int,
+                       default=server.DEFAULT_PRAGMAS['mmap_size'],
+                       help='PRAGMA mmap_size in bytes, 0 disables memory mapping (default: %(default)s)')
+    parser.add_argument('--temp-store',
+                       choices=['default', 'file', 'memory'],
+                       default=server.DEFAULT_PRAGMAS['temp_store'],
+                       help='PRAGMA temp_store (default: %(default)s)')
+    parser.add_argument('--readers',
+                       type=int,
+                       default=server.DEFAULT_READERS,
+                       help='Number of reader threads, each with its own connection (default: %(default)s)')
+    parser.add_argument('--query-timeout',
+                       type=float,
+                       default=server.DEFAULT_QUERY_TIMEOUT,
+                       help='Seconds before a running query is interrupted, 0 disables (default: %(default)s)')
+    parser.add_argument('--max-rows',
+                       type=int,
+                       default=server.DEFAULT_MAX_ROWS,
+                       help='Maximum rows returned by a single read_query call (default: %(default)s)')
+    parser.add_argument('--result-cache-size',
+                       type=int,
+                       default=server.DEFAULT_RESULT_CACHE_SIZE,
+                       help='Number of read_query results kept in memory, 0 disables (default: %(default)s)')
+    parser.add_argument('--cached-statements',
+                       type=int,
+                       default=server.DEFAULT_CACHED_STATEMENTS,
+                       help='Prepared statements cached per connection (default: %(default)s)')
+    parser.add_argument('--max-result-bytes',
+                       type=int,
+                       default=server.DEFAULT_MAX_RESULT_BYTES,
+                       help='Approximate cell data returned by a single read_query call (default: %(default)s)')
+    parser.add_argument('--soft-heap-limit',
+                       type=int,
+                       default=server.DEFAULT_SOFT_HEAP_LIMIT,
+                       help='PRAGMA soft_heap_limit in bytes, 0 disables (default: %(default)s)')
     
     args = parser.parse_args()
-    asyncio.run(server.main(args.db_path))
+    pragmas = {
+        "journal_mode": args.journal_mode,
+        "synchronous": args.synchronous,
+        "cache_size": args.cache_size,
+        "mmap_size": args.mmap_size,
+        "temp_store": args.temp_store,
+    }
+    asyncio.run(server.main(
+        args.db_path,
+        pragmas,
+        args.readers,
+        args.query_timeout,
+        args.max_rows,
+        args.result_cache_size,
+        args.cached_statements,
+        args.max_result_bytes,
+        args.soft_heap_limit,
+    ))
 
 
 # Optionally expose other important items at package level
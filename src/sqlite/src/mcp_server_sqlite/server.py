@@ -1,15 +1,29 @@
 import os
 import sys
+import time
+import asyncio
 import sqlite3
 import logging
+import threading
+import re
+import base64
+import hashlib
+import json
+import csv
+import math
+import io
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, OrderedDict
+from itertools import chain, islice
 from contextlib import closing
+from dataclasses import dataclass
 from pathlib import Path
 from mcp.server.models import InitializationOptions
 import mcp.types as types
 from mcp.server import NotificationOptions, Server
 import mcp.server.stdio
 from pydantic import AnyUrl
-from typing import Any
+from typing import Any, Callable, Iterator, TypeVar
 
 # reconfigure UnicodeEncodeError prone default (i.e. windows-1252) to utf-8
 if sys.platform == "win32" and os.environ.get('PYTHONIOENCODING') is None:
@@ -38,6 +52,7 @@ This server provides several SQL-related tools:
 "read_query": Executes SELECT queries to read data from the database
 "write_query": Executes INSERT, UPDATE, or DELETE queries to modify data
 "create_table": Creates new tables in the database
+"bulk_insert": Inserts many rows into a table in one call
 "list_tables": Shows all existing tables
 "describe_table": Shows the schema for a specific table
 "append_insight": Adds a new business insight to the memo resource
@@ -62,7 +77,7 @@ a. Instead of asking about the data that is required for the scenario, just go a
 b. Design a set of table schemas that represent the data needed for the business problem.
 c. Include at least 2-3 tables with appropriate columns and data types.
 d. Leverage the tools to create the tables in the SQLite database.
-e. Create INSERT statements to populate each table with relevant synthetic data.
+e. Populate each table with relevant synthetic data, using bulk_insert to load all of a table's rows in one call.
 f. Ensure the data is diverse and representative of the business problem.
 g. Include at least 10-15 rows of data for each table.
 
@@ -101,19 +116,216 @@ The provided XML tags are for the assistants understanding. Implore to make all
 Start your first message fully in character with something like "Oh, Hey there! I see you've chosen the topic {topic}. Let's get started! 🚀"
 """
 
+# Connection tuning applied when the database is opened; None leaves SQLite's default
+DEFAULT_PRAGMAS: dict[str, str | int | None] = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "cache_size": -64000,  # 64 MiB
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "memory",
+}
+
+DEFAULT_READERS = 4
+DEFAULT_QUERY_TIMEOUT = 30.0
+# Server-wide cap on rows returned by a single read_query call
+DEFAULT_MAX_ROWS = 1000
+FETCH_BATCH_SIZE = 1000
+# Approximate bytes of cell data returned by a single read_query call
+DEFAULT_MAX_RESULT_BYTES = 1_000_000
+# Rows past the page that are counted for the "N more rows" note; beyond it the note reads "N+"
+MAX_COUNTED_ROWS = 5_000
+# Process-wide PRAGMA soft_heap_limit; SQLite frees cache memory to stay below it
+DEFAULT_SOFT_HEAP_LIMIT = 1024 * 1024 * 1024
+DEFAULT_RESULT_CACHE_SIZE = 128
+# Rows handed to each executemany call by bulk_insert; all chunks share one transaction
+BULK_INSERT_CHUNK_SIZE = 10_000
+# Per-connection prepared statement cache; sqlite3's default is 128
+DEFAULT_CACHED_STATEMENTS = 512
+# Leading records of an imported file used to infer column types
+IMPORT_SAMPLE_ROWS = 1000
+FILE_FORMATS = ["csv", "jsonl"]
+# Distinct statements remembered for the index advisor
+QUERY_LOG_SIZE = 500
+# SQLite VM instructions between checks of the running query's deadline
+PROGRESS_HANDLER_INTERVAL = 10_000
+
+# pragma_table_list, which tells shadow tables of virtual tables apart, arrived in SQLite 3.37
+HAS_TABLE_LIST = sqlite3.sqlite_version_info >= (3, 37, 0)
+# Shadow tables each virtual table module creates, used to hide them on older SQLite versions
+SHADOW_TABLE_SUFFIXES = {
+    "fts3": ("content", "segments", "segdir", "docsize", "stat"),
+    "fts4": ("content", "segments", "segdir", "docsize", "stat"),
+    "fts5": ("data", "idx", "content", "docsize", "config"),
+    "rtree": ("node", "parent", "rowid"),
+    "rtree_i32": ("node", "parent", "rowid"),
+    "geopoly": ("node", "parent", "rowid"),
+}
+
+# Pragmas that only matter to, or can only be changed by, a connection that writes
+WRITER_PRAGMAS = {"journal_mode", "synchronous"}
+
+WRITE_PREFIXES = ('INSERT', 'UPDATE', 'DELETE', 'CREATE', 'DROP', 'ALTER')
+
+
+T = TypeVar("T")
+
+
+def _is_write(query: str) -> bool:
+    return query.strip().upper().startswith(WRITE_PREFIXES)
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+_QUOTED = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*")""")
+
+
+def _normalize_sql(query: str) -> str:
+    """Collapse whitespace outside string literals and quoted identifiers, and drop trailing semicolons"""
+    parts = _QUOTED.split(query.strip().rstrip(";"))
+    return "".join(part if i % 2 else re.sub(r"\s+", " ", part) for i, part in enumerate(parts)).strip()
+
+
+class ResultCache:
+    """LRU of read query results, tied to the database's `PRAGMA data_version`
+
+    Entries are dropped as soon as the version observed on lookup differs from
+    the one they were stored under, which catches commits from our writer and
+    from other processes alike.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_RESULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, Any] = OrderedDict()
+        self._version: int | None = None
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, version: int) -> Any | None:
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+                return None
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: tuple, version: int, value: Any) -> None:
+        with self._lock:
+            if self.max_entries <= 0 or version != self._version:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 class SqliteDatabase:
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        pragmas: dict[str, str | int | None] | None = None,
+        readers: int = DEFAULT_READERS,
+        query_timeout: float | None = DEFAULT_QUERY_TIMEOUT,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        result_cache_size: int = DEFAULT_RESULT_CACHE_SIZE,
+        cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+        max_result_bytes: int = DEFAULT_MAX_RESULT_BYTES,
+        soft_heap_limit: int = DEFAULT_SOFT_HEAP_LIMIT,
+    ):
         self.db_path = str(Path(db_path).expanduser())
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.readers = max(1, readers)
+        self.query_timeout = query_timeout or None
+        self.max_rows = max(1, max_rows)
+        self.cached_statements = cached_statements
+        self.max_result_bytes = max_result_bytes
+        self.soft_heap_limit = soft_heap_limit
+        self._results = ResultCache(result_cache_size)
         self._init_database()
         self.insights: list[str] = []
+        # Normalized SQL -> times run, most recently used last; feeds suggest_indexes
+        self.query_log: OrderedDict[str, int] = OrderedDict()
+        # (schema_version, rendered describe_schema output)
+        self._schema_cache: tuple[int, str] | None = None
+
+    def _connect(self, read_only: bool = False, cached_statements: int | None = None) -> sqlite3.Connection:
+        """Open a tuned connection; read-only ones use a `mode=ro` URI and cannot write even by accident"""
+        if cached_statements is None:
+            cached_statements = self.cached_statements
+        if read_only:
+            database, uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro", True
+        else:
+            database, uri = self.db_path, False
+        conn = sqlite3.connect(database, uri=uri, check_same_thread=False, cached_statements=cached_statements)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            if value is not None and not (read_only and name in WRITER_PRAGMAS):
+                conn.execute(f"PRAGMA {name} = {value}")
+        return conn
 
     def _init_database(self):
-        """Initialize connection to the SQLite database"""
+        """Open the writer connection and the worker pools that run queries off the event loop
+
+        All writes go through `self.conn` on a single writer thread. Reads run on a
+        pool of threads with one read-only connection each, so under WAL they
+        proceed in parallel with each other and with the writer. The writer is
+        opened first so the database and its WAL exist before any reader.
+        """
         logger.debug("Initializing database connection")
-        with closing(sqlite3.connect(self.db_path)) as conn:
-            conn.row_factory = sqlite3.Row
+        self.conn = self._connect()
+        logger.debug(f"Applied pragmas: {self.pragmas}")
+        self.conn.execute(f"PRAGMA soft_heap_limit = {int(self.soft_heap_limit)}")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        self._readers = ThreadPoolExecutor(max_workers=self.readers, thread_name_prefix="sqlite-reader")
+        self._local = threading.local()
+        self._reader_conns: list[sqlite3.Connection] = []
+        self._reader_conns_lock = threading.Lock()
+        # Dedicated connection for PRAGMA data_version: the value only moves when
+        # *other* connections commit, so it must not be one that writes
+        self._monitor = self._connect(read_only=True)
+        self._monitor_lock = threading.Lock()
+
+    def log_query(self, query: str) -> None:
+        """Count a user-issued statement in the query log"""
+        key = _normalize_sql(query)
+        self.query_log[key] = self.query_log.get(key, 0) + 1
+        self.query_log.move_to_end(key)
+        while len(self.query_log) > QUERY_LOG_SIZE:
+            self.query_log.popitem(last=False)
+
+    def _data_version(self) -> int:
+        with self._monitor_lock:
+            return self._monitor.execute("PRAGMA data_version").fetchone()[0]
+
+    def _reader_connection(self) -> sqlite3.Connection:
+        """The calling reader thread's connection, opened on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect(read_only=True)
+            self._local.conn = conn
+            with self._reader_conns_lock:
+                self._reader_conns.append(conn)
+        return conn
+
+    def close(self):
+        """Interrupt running queries, stop the worker threads and close all connections"""
+        with self._reader_conns_lock:
+            conns = [self.conn, *self._reader_conns]
+        for conn in conns:
+            conn.interrupt()
+        self._writer.shutdown(wait=True, cancel_futures=True)
+        self._readers.shutdown(wait=True, cancel_futures=True)
+        for conn in conns:
             conn.close()
+        self._monitor.close()
 
     def _synthesize_memo(self) -> str:
         """Synthesizes business insights into a formatted memo"""
@@ -134,35 +346,852 @@ class SqliteDatabase:
         logger.debug("Generated basic memo format")
         return memo
 
-    def _execute_query(self, query: str, params: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+    def _execute_query(
+        self,
+        query: str,
+        params: dict[str, Any] | None = None,
+        conn: sqlite3.Connection | None = None,
+    ) -> list[dict[str, Any]]:
         """Execute a SQL query and return results as a list of dictionaries"""
         logger.debug(f"Executing query: {query}")
+        conn = conn or self.conn
         try:
-            with closing(sqlite3.connect(self.db_path)) as conn:
-                conn.row_factory = sqlite3.Row
-                with closing(conn.cursor()) as cursor:
-                    if params:
-                        cursor.execute(query, params)
-                    else:
-                        cursor.execute(query)
+            with closing(conn.cursor()) as cursor:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
 
-                    if query.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE', 'CREATE', 'DROP', 'ALTER')):
+                # Statements without a result set (REPLACE, comment-prefixed DML, ...)
+                # report their row count; whatever opened a transaction is committed
+                # so the long-lived writer never holds the lock between calls
+                if cursor.description is None:
+                    if conn.in_transaction:
                         conn.commit()
-                        affected = cursor.rowcount
-                        logger.debug(f"Write query affected {affected} rows")
-                        return [{"affected_rows": affected}]
+                    affected = cursor.rowcount
+                    logger.debug(f"Write query affected {affected} rows")
+                    return [{"affected_rows": affected}]
 
-                    results = [dict(row) for row in cursor.fetchall()]
-                    logger.debug(f"Read query returned {len(results)} rows")
-                    return results
+                results = [dict(row) for row in cursor.fetchall()]
+                if conn.in_transaction:
+                    conn.commit()
+                logger.debug(f"Query returned {len(results)} rows")
+                return results
         except Exception as e:
             logger.error(f"Database error executing query: {e}")
+            # Don't leave a failed statement's implicit transaction open on the shared connection
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+    def _fetch_page(
+        self,
+        query: str,
+        params: dict[str, Any] | None = None,
+        offset: int = 0,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        conn: sqlite3.Connection | None = None,
+    ) -> "QueryResult":
+        """Execute a read query and return up to `max_rows` rows after skipping `offset`
+
+        Rows are pulled with `fetchmany`, so skipped and trailing rows are only
+        counted, never held in memory. The page is cut short once its cells
+        exceed `max_result_bytes`, and counting stops after MAX_COUNTED_ROWS so a
+        large or runaway result still returns its page quickly.
+        """
+        logger.debug(f"Executing paged query: {query} (offset={offset}, max_rows={max_rows})")
+        conn = conn or self.conn
+        with closing(conn.cursor()) as cursor:
+            cursor.row_factory = None
+            cursor.execute(query, params or ())
+            columns = [column[0] for column in cursor.description or ()]
+
+            skipped = 0
+            while skipped < offset:
+                batch = cursor.fetchmany(min(FETCH_BATCH_SIZE, offset - skipped))
+                if not batch:
+                    break
+                skipped += len(batch)
+
+            rows = cursor.fetchmany(max_rows)
+            size = 0
+            for kept, row in enumerate(rows):
+                size += _row_size(row)
+                if size > self.max_result_bytes and kept:
+                    rows, overflow = rows[:kept], rows[kept:]
+                    break
+            else:
+                overflow = []
+
+            remaining = len(overflow)
+            exact = True
+            while batch := cursor.fetchmany(FETCH_BATCH_SIZE):
+                remaining += len(batch)
+                if remaining > MAX_COUNTED_ROWS:
+                    remaining, exact = MAX_COUNTED_ROWS, False
+                    break
+        logger.debug(f"Paged query returned {len(rows)} rows, {remaining}{'' if exact else '+'} more")
+        return QueryResult(columns, rows, skipped, remaining, exact)
+
+    def _bulk_insert(
+        self,
+        table: str,
+        columns: list[str],
+        rows: list[list[Any]],
+        conn: sqlite3.Connection | None = None,
+    ) -> int:
+        """Insert `rows` into `table` with chunked `executemany` calls inside a single transaction"""
+        logger.debug(f"Bulk inserting {len(rows)} rows into {table}")
+        conn = conn or self.conn
+        statement = (
+            f"INSERT INTO {_quote_identifier(table)} ({', '.join(_quote_identifier(c) for c in columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+        try:
+            with closing(conn.cursor()) as cursor:
+                # The first INSERT opens the transaction; later chunks join it
+                for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+                    cursor.executemany(statement, rows[start:start + BULK_INSERT_CHUNK_SIZE])
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Database error during bulk insert: {e}")
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        return len(rows)
+
+    def _import_file(
+        self,
+        path: str,
+        table: str,
+        file_format: str,
+        conn: sqlite3.Connection | None = None,
+    ) -> dict[str, Any]:
+        """Stream a CSV or JSONL file into `table`, creating it from a sample of the records if needed"""
+        logger.debug(f"Importing {path} into {table} as {file_format}")
+        conn = conn or self.conn
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            columns, records = _read_records(f, file_format)
+            sample = list(islice(records, IMPORT_SAMPLE_ROWS))
+            types_ = _infer_column_types(columns, sample)
+            statement = (
+                f"INSERT INTO {_quote_identifier(table)} ({', '.join(_quote_identifier(c) for c in columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})"
+            )
+            rows = (
+                [_convert_value(value, type_) for value, type_ in zip(record, types_)]
+                for record in chain(sample, records)
+            )
+            imported = 0
+            try:
+                conn.execute("BEGIN")
+                created = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+                ).fetchone() is None
+                if created:
+                    definitions = ", ".join(f"{_quote_identifier(c)} {t}" for c, t in zip(columns, types_))
+                    conn.execute(f"CREATE TABLE {_quote_identifier(table)} ({definitions})")
+                with closing(conn.cursor()) as cursor:
+                    while chunk := list(islice(rows, BULK_INSERT_CHUNK_SIZE)):
+                        self._renew_deadline()
+                        cursor.executemany(statement, chunk)
+                        imported += len(chunk)
+                conn.commit()
+            except Exception as e:
+                logger.error(f"Database error importing {path}: {e}")
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+        logger.debug(f"Imported {imported} rows into {table}")
+        return {
+            "table": table,
+            "imported_rows": imported,
+            "created": created,
+            "columns": dict(zip(columns, types_)),
+        }
+
+    def _export_query(
+        self,
+        query: str,
+        path: str,
+        file_format: str,
+        conn: sqlite3.Connection | None = None,
+    ) -> dict[str, Any]:
+        """Stream the results of `query` to a CSV or JSONL file
+
+        Rows are written to a temporary file next to `path`, which replaces
+        `path` only once every row was written, so a failing query leaves an
+        existing file untouched.
+        """
+        logger.debug(f"Exporting query to {path} as {file_format}: {query}")
+        conn = conn or self.conn
+        exported = 0
+        target = Path(path)
+        partial = target.with_name(f".{target.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+        with closing(conn.cursor()) as cursor:
+            cursor.row_factory = None
+            cursor.execute(query)
+            columns = [column[0] for column in cursor.description or ()]
+            try:
+                with open(partial, "x", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f, lineterminator="\n") if file_format == "csv" else None
+                    if writer:
+                        writer.writerow(columns)
+                    while True:
+                        self._renew_deadline()
+                        if not (batch := cursor.fetchmany(FETCH_BATCH_SIZE)):
+                            break
+                        if writer:
+                            writer.writerows([_text_value(value) for value in row] for row in batch)
+                        else:
+                            f.writelines(
+                                json.dumps(dict(zip(columns, map(_json_value, row))), ensure_ascii=False) + "\n"
+                                for row in batch
+                            )
+                        exported += len(batch)
+                os.replace(partial, target)
+            except BaseException:
+                partial.unlink(missing_ok=True)
+                raise
+        logger.debug(f"Exported {exported} rows to {path}")
+        return {"path": path, "exported_rows": exported}
+
+    def _renew_deadline(self) -> None:
+        """Give the calling thread's statements another `query_timeout` seconds
+
+        File transfers call this for every chunk, so the timeout bounds each
+        chunk rather than the whole file.
+        """
+        if self.query_timeout is not None:
+            self._local.deadline = time.monotonic() + self.query_timeout
+
+    def _with_deadline(self, conn: sqlite3.Connection, func: Callable[..., T], *args: Any) -> T:
+        """Call `func(*args, conn=conn)`, interrupting it once `query_timeout` has elapsed"""
+        if self.query_timeout is None:
+            return func(*args, conn=conn)
+
+        self._renew_deadline()
+        local = self._local
+        conn.set_progress_handler(lambda: time.monotonic() > local.deadline, PROGRESS_HANDLER_INTERVAL)
+        try:
+            return func(*args, conn=conn)
+        except sqlite3.OperationalError as e:
+            if time.monotonic() > local.deadline and "interrupt" in str(e):
+                raise sqlite3.OperationalError(
+                    f"Query interrupted after exceeding the {self.query_timeout:g}s timeout"
+                ) from e
             raise
+        finally:
+            conn.set_progress_handler(None, 0)
+
+    async def _run(self, write: bool, func: Callable[..., T], *args: Any) -> T:
+        """Run `func` on a worker thread without blocking the event loop
+
+        Writes are serialized on the writer connection; reads go to the reader
+        pool. If the awaiting task is cancelled, for instance because the
+        client cancelled the tool call, the statement is interrupted.
+        """
+        running: list[sqlite3.Connection] = []
+
+        def run() -> T:
+            conn = self.conn if write else self._reader_connection()
+            running.append(conn)
+            try:
+                return self._with_deadline(conn, func, *args)
+            finally:
+                if write:
+                    self._results.clear()
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._writer if write else self._readers, run)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            for conn in running:
+                conn.interrupt()
+            raise
+
+    async def execute(
+        self, query: str, params: dict[str, Any] | None = None, write: bool | None = None
+    ) -> list[dict[str, Any]]:
+        """Run `_execute_query` off the event loop; `write` is inferred from the statement if not given"""
+        if write is None:
+            write = _is_write(query)
+        return await self._run(write, self._execute_query, query, params)
+
+    def _explain(self, query: str, conn: sqlite3.Connection | None = None) -> list[tuple[int, int, str]]:
+        """(id, parent, detail) rows of `EXPLAIN QUERY PLAN` for `query`
+
+        The plan is fixed when a statement is prepared, and a cached EXPLAIN is
+        not re-prepared after a schema change, so this bypasses the statement
+        cache of the pooled connections.
+        """
+        with closing(self._connect(read_only=True, cached_statements=0)) as fresh:
+            return _query_plan(fresh, query)
+
+    def _advise_indexes(self, queries: list[tuple[str, int]], conn: sqlite3.Connection | None = None) -> list[dict[str, Any]]:
+        conn = conn or self.conn
+        schema = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' "
+            "ORDER BY CASE type WHEN 'table' THEN 0 WHEN 'index' THEN 1 ELSE 2 END"
+        ).fetchall()
+        return advise_indexes([row[0] for row in schema], queries)
+
+    def _describe_schema(self, conn: sqlite3.Connection | None = None) -> str:
+        """Every table and view with its columns, indexes and foreign keys, cached per schema_version"""
+        conn = conn or self.conn
+        # Read the version first: a change racing the queries below is caught on the next call
+        version = conn.execute("PRAGMA schema_version").fetchone()[0]
+        cached = self._schema_cache
+        if cached is not None and cached[0] == version:
+            logger.debug(f"Schema cache hit at version {version}")
+            return cached[1]
+
+        objects = _schema_objects_query(conn)
+        columns = conn.execute(
+            f"SELECT m.name, m.type, p.name, p.type, p.\"notnull\", p.dflt_value, p.pk "
+            f"FROM ({objects}) AS m JOIN pragma_table_info(m.name) AS p ORDER BY m.name, p.cid"
+        ).fetchall()
+        indexes = conn.execute(
+            f"SELECT m.name, il.name, il.\"unique\", il.origin, ii.name "
+            f"FROM ({objects}) AS m JOIN pragma_index_list(m.name) AS il JOIN pragma_index_info(il.name) AS ii "
+            f"ORDER BY m.name, il.name, ii.seqno"
+        ).fetchall()
+        foreign_keys = conn.execute(
+            f"SELECT m.name, fk.id, fk.\"table\", fk.\"from\", fk.\"to\" "
+            f"FROM ({objects}) AS m JOIN pragma_foreign_key_list(m.name) AS fk ORDER BY m.name, fk.id, fk.seq"
+        ).fetchall()
+
+        text = render_schema(
+            [tuple(row) for row in columns],
+            [tuple(row) for row in indexes],
+            [tuple(row) for row in foreign_keys],
+        )
+        self._schema_cache = (version, text)
+        return text
+
+    async def describe_schema(self) -> str:
+        """Run `_describe_schema` on the reader pool"""
+        return await self._run(False, self._describe_schema)
+
+    async def explain(self, query: str) -> str:
+        """Render the query plan of `query` as a tree with slow steps flagged"""
+        return render_plan(await self._run(False, self._explain, query))
+
+    async def suggest_indexes(self, create: bool = False) -> list[dict[str, Any]]:
+        """Index suggestions for the logged queries, most frequently run first; optionally create them"""
+        queries = sorted(self.query_log.items(), key=lambda item: item[1], reverse=True)
+        suggestions = await self._run(False, self._advise_indexes, queries)
+        if create:
+            for suggestion in suggestions:
+                await self.execute(suggestion["statement"], write=True)
+                suggestion["created"] = True
+        return suggestions
+
+    async def bulk_insert(self, table: str, columns: list[str], rows: list[list[Any]]) -> int:
+        """Run `_bulk_insert` on the writer thread"""
+        if not columns:
+            raise ValueError("At least one column is required")
+        for number, row in enumerate(rows, 1):
+            if len(row) != len(columns):
+                raise ValueError(f"Row {number} has {len(row)} values, expected {len(columns)}")
+        return await self._run(True, self._bulk_insert, table, columns, rows)
+
+    async def import_file(self, path: str, table: str, file_format: str | None = None) -> dict[str, Any]:
+        """Run `_import_file` on the writer thread"""
+        path = str(Path(path).expanduser())
+        return await self._run(True, self._import_file, path, table, _file_format(path, file_format))
+
+    async def export_query(self, query: str, path: str, file_format: str | None = None) -> dict[str, Any]:
+        """Run `_export_query` on the reader pool"""
+        path = str(Path(path).expanduser())
+        return await self._run(False, self._export_query, query, path, _file_format(path, file_format))
+
+    async def fetch_page(
+        self, query: str, params: dict[str, Any] | None = None, offset: int = 0, max_rows: int | None = None
+    ) -> "QueryResult":
+        """Run `_fetch_page` on the reader pool, capping `max_rows` at the server-wide limit"""
+        if offset < 0:
+            raise ValueError("offset must not be negative")
+        if max_rows is not None and max_rows < 1:
+            raise ValueError("max_rows must be at least 1")
+        max_rows = min(max_rows or self.max_rows, self.max_rows)
+        key = ("page", _normalize_sql(query), _params_key(params), offset, max_rows)
+        return await self._run(False, self._cached, key, self._fetch_page, query, params, offset, max_rows)
+
+    def _cached(self, key: tuple, func: Callable[..., T], *args: Any, conn: sqlite3.Connection) -> T:
+        """Return the cached result for `key`, or call `func` on `conn` and cache what it returns"""
+        version = self._data_version()
+        result = self._results.get(key, version)
+        if result is not None:
+            logger.debug(f"Result cache hit: {key[1]}")
+            return result
+        result = func(*args, conn=conn)
+        self._results.put(key, version, result)
+        return result
+
+
+@dataclass
+class QueryResult:
+    """One page of a read query's result set"""
+    columns: list[str]
+    rows: list[tuple[Any, ...]]
+    offset: int
+    remaining: int
+    # False when counting stopped early and `remaining` is a lower bound
+    remaining_exact: bool = True
+
+    def as_dicts(self) -> list[dict[str, Any]]:
+        return [dict(zip(self.columns, row)) for row in self.rows]
+
+
+def encode_cursor(query: str, offset: int) -> str:
+    """Opaque continuation token for the page of `query` starting at `offset`"""
+    payload = {"query": _query_fingerprint(query), "offset": offset}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(query: str, cursor: str) -> int:
+    """Offset encoded in `cursor`, which must have been issued for `query`"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        offset = int(payload["offset"])
+        fingerprint = payload["query"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor") from None
+    if fingerprint != _query_fingerprint(query) or offset < 0:
+        raise ValueError("Cursor does not belong to this query")
+    return offset
+
+
+def _params_key(params: dict[str, Any] | None) -> tuple:
+    return tuple(sorted(params.items())) if params else ()
+
+
+def _query_fingerprint(query: str) -> str:
+    return hashlib.sha256(" ".join(query.split()).encode()).hexdigest()[:16]
+
+
+def _row_size(row: tuple[Any, ...]) -> int:
+    """Rough in-memory size of a row's cell data"""
+    return sum(len(value) if isinstance(value, (str, bytes)) else 8 for value in row)
+
+
+def _text_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
+
+
+def _json_value(value: Any) -> Any:
+    return value.hex() if isinstance(value, bytes) else value
+
+
+def _delimited(result: QueryResult, delimiter: str) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter, lineterminator="\n")
+    writer.writerow(result.columns)
+    writer.writerows([_text_value(value) for value in row] for row in result.rows)
+    return buffer.getvalue().rstrip("\n")
+
+
+def _markdown(result: QueryResult) -> str:
+    def cell(value: Any) -> str:
+        return _text_value(value).replace("|", "\\|").replace("\n", " ")
+
+    lines = [
+        "| " + " | ".join(cell(column) for column in result.columns) + " |",
+        "|" + "---|" * len(result.columns),
+    ]
+    lines.extend("| " + " | ".join(cell(value) for value in row) + " |" for row in result.rows)
+    return "\n".join(lines)
+
+
+# read_query output formats; "json" lists column names once followed by one array per row
+OUTPUT_FORMATS = ["objects", "json", "csv", "tsv", "markdown"]
+
+
+def format_page(query: str, result: QueryResult, output_format: str = "objects") -> str:
+    """Render a result page, noting how many rows were left out and how to continue"""
+    cursor = encode_cursor(query, result.offset + len(result.rows)) if result.remaining else None
+
+    if output_format == "json":
+        payload: dict[str, Any] = {
+            "columns": result.columns,
+            "rows": [[_json_value(value) for value in row] for row in result.rows],
+        }
+        if cursor:
+            payload.update(more_rows=result.remaining, cursor=cursor)
+            if not result.remaining_exact:
+                payload["more_rows_exact"] = False
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+    if output_format == "objects":
+        text = str(result.as_dicts())
+    elif output_format == "csv":
+        text = _delimited(result, ",")
+    elif output_format == "tsv":
+        text = _delimited(result, "\t")
+    elif output_format == "markdown":
+        text = _markdown(result)
+    else:
+        raise ValueError(f"Unknown format: {output_format}")
+
+    if cursor:
+        more = f"{result.remaining}{'' if result.remaining_exact else '+'}"
+        text += f"\n\n[truncated, {more} more rows; pass cursor \"{cursor}\" for the next page]"
+    return text
+
+
+def _schema_objects_query(conn: sqlite3.Connection) -> str:
+    """SQL listing the (name, type) of each table and view; virtual tables are
+    labelled as such and the shadow tables holding their data left out"""
+    if HAS_TABLE_LIST:
+        return (
+            "SELECT name, CASE type WHEN 'virtual' THEN 'virtual table' ELSE type END AS type "
+            "FROM pragma_table_list WHERE schema = 'main' AND type IN ('table', 'view', 'virtual') "
+            "AND name NOT LIKE 'sqlite_%'"
+        )
+
+    # Without pragma_table_list, hide the tables the module of each virtual table is known to create
+    shadow_tables = [
+        f"{name}_{suffix}"
+        for name, sql in conn.execute("SELECT name, sql FROM sqlite_master WHERE sql LIKE 'CREATE VIRTUAL TABLE%'")
+        if (module := re.search(r"\bUSING\s+(\w+)", sql, re.IGNORECASE))
+        for suffix in SHADOW_TABLE_SUFFIXES.get(module.group(1).lower(), ())
+    ]
+    excluded = ", ".join("'" + name.replace("'", "''") + "'" for name in shadow_tables)
+    return (
+        "SELECT name, CASE WHEN sql LIKE 'CREATE VIRTUAL TABLE%' THEN 'virtual table' ELSE type END AS type "
+        "FROM sqlite_master WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%'"
+        + (f" AND name NOT IN ({excluded})" if excluded else "")
+    )
+
+
+def _query_plan(conn: sqlite3.Connection, query: str) -> list[tuple[int, int, str]]:
+    with closing(conn.cursor()) as cursor:
+        cursor.row_factory = None
+        cursor.execute(f"EXPLAIN QUERY PLAN {query}")
+        return [(node_id, parent, detail) for node_id, parent, _, detail in cursor.fetchall()]
+
+
+def _plan_warning(detail: str) -> str | None:
+    """Why a query plan step is likely to be slow on a large table, if it is"""
+    if detail.startswith("SCAN ") and " USING " not in detail and "VIRTUAL TABLE" not in detail \
+            and detail != "SCAN CONSTANT ROW":
+        return "full table scan"
+    if "TEMP B-TREE" in detail:
+        return "temporary B-tree"
+    return None
+
+
+def render_plan(plan: list[tuple[int, int, str]]) -> str:
+    """Draw a query plan as a tree, in the style of the sqlite3 shell's `.eqp` output"""
+    children: dict[int, list[tuple[int, str]]] = {}
+    for node_id, parent, detail in plan:
+        children.setdefault(parent, []).append((node_id, detail))
+
+    lines = ["QUERY PLAN"]
+    warnings = 0
+
+    def walk(parent: int, prefix: str) -> None:
+        nonlocal warnings
+        nodes = children.get(parent, [])
+        for i, (node_id, detail) in enumerate(nodes):
+            last = i == len(nodes) - 1
+            warning = _plan_warning(detail)
+            warnings += warning is not None
+            lines.append(f"{prefix}{'`--' if last else '|--'}{detail}" + (f"  <-- {warning}" if warning else ""))
+            walk(node_id, prefix + ("   " if last else "|  "))
+
+    walk(0, "")
+    if warnings:
+        lines.append("")
+        lines.append(f"{warnings} step(s) flagged; suggest_indexes can propose indexes for logged queries")
+    return "\n".join(lines)
+
+
+def render_schema(
+    columns: list[tuple[Any, ...]],
+    indexes: list[tuple[Any, ...]],
+    foreign_keys: list[tuple[Any, ...]],
+) -> str:
+    """Compact DDL-like listing: one line per table or view, followed by its indexes
+
+    `columns` rows are (object, object type, name, type, notnull, default, pk),
+    `indexes` rows (table, index, unique, origin, column) and `foreign_keys`
+    rows (table, id, referenced table, from, to), all in the order SQLite
+    reports them.
+    """
+    references: dict[str, dict[int, tuple[str, list[str], list[str | None]]]] = {}
+    for table, fk_id, target, source, target_column in foreign_keys:
+        _, sources, targets = references.setdefault(table, {}).setdefault(fk_id, (target, [], []))
+        sources.append(source)
+        targets.append(target_column)
+
+    key_columns = Counter(row[0] for row in columns if row[6])
+    composite_keys: dict[str, list[tuple[int, str]]] = {}
+    definitions: dict[str, tuple[str, list[str], list[str]]] = {}
+    for table, object_type, name, type_, notnull, default, pk in columns:
+        _, parts, _ = definitions.setdefault(table, (object_type, [], []))
+        if pk and key_columns[table] > 1:
+            composite_keys.setdefault(table, []).append((pk, name))
+        parts.append(" ".join(filter(None, [
+            _quote_if_needed(name),
+            type_,
+            "PRIMARY KEY" if pk and key_columns[table] == 1 else "",
+            "NOT NULL" if notnull else "",
+            f"DEFAULT {default}" if default is not None else "",
+        ])))
+    for table, keys in composite_keys.items():
+        definitions[table][1].append(f"PRIMARY KEY({', '.join(_quote_if_needed(name) for _, name in sorted(keys))})")
+
+    for table, constraints in references.items():
+        if table not in definitions:
+            continue
+        _, parts, _ = definitions[table]
+        for target, sources, targets in constraints.values():
+            target_columns = f"({', '.join(_quote_if_needed(t) for t in targets)})" if all(targets) else ""
+            parts.append(
+                f"FOREIGN KEY({', '.join(_quote_if_needed(s) for s in sources)}) "
+                f"REFERENCES {_quote_if_needed(target)}{target_columns}"
+            )
+
+    grouped: dict[tuple[str, str], tuple[bool, str, list[str]]] = {}
+    for table, index, unique, origin, column in indexes:
+        if origin == "pk":
+            continue
+        grouped.setdefault((table, index), (bool(unique), origin, []))[2].append(_quote_if_needed(column) if column else "<expr>")
+    for (table, index), (unique, origin, index_columns) in grouped.items():
+        if table in definitions:
+            kind = "UNIQUE" if origin == "u" else ("UNIQUE INDEX" if unique else "INDEX")
+            name = "" if origin == "u" else f" {_quote_if_needed(index)}"
+            definitions[table][2].append(f"  {kind}{name}({', '.join(index_columns)})")
+
+    if not definitions:
+        return "The database has no tables"
+    lines = []
+    for table, (object_type, parts, index_lines) in definitions.items():
+        prefix = {"view": "VIEW ", "virtual table": "VIRTUAL TABLE "}.get(object_type, "")
+        lines.append(f"{prefix}{_quote_if_needed(table)}({', '.join(parts)})")
+        lines.extend(index_lines)
+    return "\n".join(lines)
+
+
+def _quote_if_needed(identifier: str) -> str:
+    return identifier if re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", identifier) else _quote_identifier(identifier)
+
+
+def _mentions(query: str, identifier: str) -> bool:
+    return re.search(rf"(?<![\w$]){re.escape(identifier)}(?![\w$])", query, re.IGNORECASE) is not None
+
+
+def advise_indexes(schema: list[str], queries: list[tuple[str, int]]) -> list[dict[str, Any]]:
+    """Single-column indexes that would let SQLite stop scanning or sorting for `queries`
+
+    Like the sqlite3 shell's `.expert`, this replays `schema` into an empty
+    in-memory database and creates each candidate index there, so trying an
+    index costs nothing however large the real tables are. A candidate is any
+    column of a table named in the query that the query also mentions, and it
+    is suggested when the planner then searches with it or needs fewer
+    temporary B-trees.
+    """
+    suggestions: dict[tuple[str, str], dict[str, Any]] = {}
+    with closing(sqlite3.connect(":memory:")) as shadow:
+        for sql in schema:
+            try:
+                shadow.execute(sql)
+            except sqlite3.Error as e:
+                logger.debug(f"Skipping schema entry in index advisor: {e}")
+
+        tables = [row[0] for row in shadow.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        columns = {
+            table: [row[0] for row in shadow.execute("SELECT name FROM pragma_table_info(?)", (table,))]
+            for table in tables
+        }
+        indexed = {
+            table: {
+                row[0]
+                for row in shadow.execute(
+                    "SELECT ii.name FROM pragma_index_list(?) AS il, pragma_index_info(il.name) AS ii "
+                    "WHERE ii.seqno = 0",
+                    (table,),
+                )
+            }
+            for table in tables
+        }
+
+        for query, count in queries:
+            try:
+                before = [detail for _, _, detail in _query_plan(shadow, query)]
+            except sqlite3.Error:
+                continue
+            if not any(_plan_warning(detail) for detail in before):
+                continue
+            sorts_before = sum("TEMP B-TREE" in detail for detail in before)
+
+            for table in tables:
+                if not _mentions(query, table):
+                    continue
+                for column in columns[table]:
+                    if column in indexed[table] or not _mentions(query, column):
+                        continue
+                    name = "idx_" + re.sub(r"\W", "_", f"{table}_{column}")
+                    shadow.execute(f"CREATE INDEX {_quote_identifier(name)} ON {_quote_identifier(table)} ({_quote_identifier(column)})")
+                    try:
+                        after = [detail for _, _, detail in _query_plan(shadow, query)]
+                    finally:
+                        shadow.execute(f"DROP INDEX {_quote_identifier(name)}")
+
+                    uses = [d for d in after if re.search(rf"INDEX {re.escape(name)}\b", d)]
+                    sorts_after = sum("TEMP B-TREE" in detail for detail in after)
+                    if not uses or not (any(d.startswith("SEARCH") for d in uses) or sorts_after < sorts_before):
+                        continue
+                    suggestion = suggestions.setdefault((table, column), {
+                        "table": table,
+                        "column": column,
+                        "statement": f"CREATE INDEX IF NOT EXISTS {_quote_identifier(name)} "
+                                     f"ON {_quote_identifier(table)} ({_quote_identifier(column)})",
+                        "queries": 0,
+                        "executions": 0,
+                    })
+                    suggestion["queries"] += 1
+                    suggestion["executions"] += count
+
+    return sorted(suggestions.values(), key=lambda s: s["executions"], reverse=True)
+
+
+def _file_format(path: str, file_format: str | None) -> str:
+    """`file_format` if given, otherwise inferred from the file extension"""
+    if file_format is None:
+        suffix = Path(path).suffix.lower()
+        file_format = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(suffix)
+        if file_format is None:
+            raise ValueError(f"Cannot infer the file format from {path!r}; pass format explicitly")
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"Unknown file format: {file_format}")
+    return file_format
+
+
+def _read_records(f: io.TextIOBase, file_format: str) -> tuple[list[str], Iterator[list[Any]]]:
+    """Column names and a lazy iterator of value lists for a CSV or JSONL file
+
+    CSV columns come from the header row. JSONL columns are the keys seen in
+    the first IMPORT_SAMPLE_ROWS objects, so the head of the file is parsed
+    up front and replayed.
+    """
+    if file_format == "csv":
+        reader = csv.reader(f)
+        columns = next(reader, None)
+        if not columns:
+            raise ValueError("CSV file has no header row")
+
+        def csv_records() -> Iterator[list[Any]]:
+            for record in reader:
+                if len(record) != len(columns):
+                    raise ValueError(
+                        f"Line {reader.line_num} has {len(record)} fields, expected {len(columns)}"
+                    )
+                yield record
+
+        return columns, csv_records()
+
+    def objects() -> Iterator[tuple[int, dict[str, Any]]]:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            value = json.loads(line)
+            if not isinstance(value, dict):
+                raise ValueError(f"Line {number} is not a JSON object")
+            yield number, value
+
+    parsed = objects()
+    head = list(islice(parsed, IMPORT_SAMPLE_ROWS))
+    columns = list(dict.fromkeys(key for _, value in head for key in value))
+    if not columns:
+        raise ValueError("JSONL file has no records")
+
+    def jsonl_records() -> Iterator[list[Any]]:
+        known = set(columns)
+        for number, value in chain(head, parsed):
+            unknown = value.keys() - known
+            if unknown:
+                raise ValueError(f"Line {number} has keys not seen in the sampled records: {sorted(unknown)}")
+            yield [value.get(column) for column in columns]
+
+    return columns, jsonl_records()
+
+
+_TYPE_RANK = {"INTEGER": 0, "REAL": 1, "TEXT": 2}
+# Plain decimal numbers; int() and float() alone would also accept "1_000", " 1", "nan" and "inf"
+_INTEGER_TEXT = re.compile(r"[+-]?[0-9]+")
+_REAL_TEXT = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?")
+
+
+def _value_type(value: Any) -> str:
+    if isinstance(value, (bool, int)):
+        return "INTEGER"
+    if isinstance(value, float):
+        return "REAL"
+    if isinstance(value, str):
+        # Integers outside SQLite's 64-bit range cannot be bound as parameters
+        if _INTEGER_TEXT.fullmatch(value) and -2**63 <= int(value) < 2**63:
+            return "INTEGER"
+        if _REAL_TEXT.fullmatch(value) and math.isfinite(float(value)):
+            return "REAL"
+    return "TEXT"
+
+
+def _infer_column_types(columns: list[str], sample: list[list[Any]]) -> list[str]:
+    """Narrowest of INTEGER, REAL and TEXT that holds every non-empty sampled value of each column"""
+    types_ = []
+    for index in range(len(columns)):
+        seen = [_value_type(row[index]) for row in sample if row[index] not in (None, "")]
+        types_.append(max(seen, key=_TYPE_RANK.__getitem__) if seen else "TEXT")
+    return types_
+
+
+def _convert_value(value: Any, type_: str) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if value == "" and type_ != "TEXT":
+        return None
+    if isinstance(value, str) and type_ != "TEXT":
+        # Values the sample did not cover are stored as they are, as in any SQLite column
+        value_type = _value_type(value)
+        if value_type == "INTEGER" and type_ == "INTEGER":
+            return int(value)
+        if value_type != "TEXT":
+            return float(value)
+    return value
+
 
-async def main(db_path: str):
+async def main(
+    db_path: str,
+    pragmas: dict[str, str | int | None] | None = None,
+    readers: int = DEFAULT_READERS,
+    query_timeout: float | None = DEFAULT_QUERY_TIMEOUT,
+    max_rows: int = DEFAULT_MAX_ROWS,
+    result_cache_size: int = DEFAULT_RESULT_CACHE_SIZE,
+    cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+    max_result_bytes: int = DEFAULT_MAX_RESULT_BYTES,
+    soft_heap_limit: int = DEFAULT_SOFT_HEAP_LIMIT,
+):
     logger.info(f"Starting SQLite MCP Server with DB path: {db_path}")
 
-    db = SqliteDatabase(db_path)
+    db = SqliteDatabase(
+        db_path,
+        pragmas,
+        readers,
+        query_timeout,
+        max_rows,
+        result_cache_size,
+        cached_statements,
+        max_result_bytes,
+        soft_heap_limit,
+    )
     server = Server("sqlite-manager")
 
     # Register handlers
@@ -247,6 +1276,22 @@ async def main(db_path: str):
                     "type": "object",
                     "properties": {
                         "query": {"type": "string", "description": "SELECT SQL query to execute"},
+                        "max_rows": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "description": f"Maximum rows to return (capped at {db.max_rows})",
+                        },
+                        "offset": {"type": "integer", "minimum": 0, "description": "Rows to skip before the first returned row"},
+                        "cursor": {
+                            "type": "string",
+                            "description": "Continuation cursor from a truncated result; takes precedence over offset",
+                        },
+                        "format": {
+                            "type": "string",
+                            "enum": OUTPUT_FORMATS,
+                            "description": "Result encoding: objects (list of row objects), json (column names once, "
+                            "then row arrays), csv, tsv or markdown table",
+                        },
                     },
                     "required": ["query"],
                 },
@@ -273,6 +1318,85 @@ async def main(db_path: str):
                     "required": ["query"],
                 },
             ),
+            types.Tool(
+                name="bulk_insert",
+                description="Insert many rows into a table in a single transaction",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "table_name": {"type": "string", "description": "Table to insert into"},
+                        "columns": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Column names, in the order values appear in each row",
+                        },
+                        "rows": {
+                            "type": "array",
+                            "items": {"type": "array"},
+                            "description": "Rows to insert, each an array of values matching columns",
+                        },
+                    },
+                    "required": ["table_name", "columns", "rows"],
+                },
+            ),
+            types.Tool(
+                name="import_file",
+                description="Load a CSV or JSONL file into a table, creating the table with inferred column types if it does not exist",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "path": {"type": "string", "description": "Path of the file to import"},
+                        "table_name": {"type": "string", "description": "Table to load the records into"},
+                        "format": {
+                            "type": "string",
+                            "enum": FILE_FORMATS,
+                            "description": "File format; inferred from the extension if omitted",
+                        },
+                    },
+                    "required": ["path", "table_name"],
+                },
+            ),
+            types.Tool(
+                name="export_query",
+                description="Write the results of a SELECT query to a CSV or JSONL file",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string", "description": "SELECT SQL query to export"},
+                        "path": {"type": "string", "description": "Path of the file to write"},
+                        "format": {
+                            "type": "string",
+                            "enum": FILE_FORMATS,
+                            "description": "File format; inferred from the extension if omitted",
+                        },
+                    },
+                    "required": ["query", "path"],
+                },
+            ),
+            types.Tool(
+                name="explain_query",
+                description="Show the query plan SQLite would use for a statement, flagging full table scans and temporary B-trees",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string", "description": "SQL statement to explain; it is not executed"},
+                    },
+                    "required": ["query"],
+                },
+            ),
+            types.Tool(
+                name="suggest_indexes",
+                description="Suggest indexes that would speed up the queries run so far in this session, optionally creating them",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "create": {
+                            "type": "boolean",
+                            "description": "Create the suggested indexes (default: false)",
+                        },
+                    },
+                },
+            ),
             types.Tool(
                 name="list_tables",
                 description="List all tables in the SQLite database",
@@ -292,6 +1416,14 @@ async def main(db_path: str):
                     "required": ["table_name"],
                 },
             ),
+            types.Tool(
+                name="describe_schema",
+                description="Get every table and view with its columns, indexes and foreign keys in one call",
+                inputSchema={
+                    "type": "object",
+                    "properties": {},
+                },
+            ),
             types.Tool(
                 name="append_insight",
                 description="Add a business insight to the memo",
@@ -312,7 +1444,7 @@ async def main(db_path: str):
         """Handle tool execution requests"""
         try:
             if name == "list_tables":
-                results = db._execute_query(
+                results = await db.execute(
                     "SELECT name FROM sqlite_master WHERE type='table'"
                 )
                 return [types.TextContent(type="text", text=str(results))]
@@ -320,11 +1452,15 @@ async def main(db_path: str):
             elif name == "describe_table":
                 if not arguments or "table_name" not in arguments:
                     raise ValueError("Missing table_name argument")
-                results = db._execute_query(
-                    f"PRAGMA table_info({arguments['table_name']})"
+                results = await db.execute(
+                    "SELECT * FROM pragma_table_info(:table_name)",
+                    {"table_name": arguments["table_name"]},
                 )
                 return [types.TextContent(type="text", text=str(results))]
 
+            elif name == "describe_schema":
+                return [types.TextContent(type="text", text=await db.describe_schema())]
+
             elif name == "append_insight":
                 if not arguments or "insight" not in arguments:
                     raise ValueError("Missing insight argument")
@@ -337,27 +1473,63 @@ async def main(db_path: str):
 
                 return [types.TextContent(type="text", text="Insight added to memo")]
 
+            elif name == "suggest_indexes":
+                suggestions = await db.suggest_indexes(bool((arguments or {}).get("create", False)))
+                if not suggestions:
+                    return [types.TextContent(
+                        type="text",
+                        text=f"No index suggestions for the {len(db.query_log)} logged queries",
+                    )]
+                return [types.TextContent(type="text", text=str(suggestions))]
+
             if not arguments:
                 raise ValueError("Missing arguments")
 
             if name == "read_query":
                 if not arguments["query"].strip().upper().startswith("SELECT"):
                     raise ValueError("Only SELECT queries are allowed for read_query")
-                results = db._execute_query(arguments["query"])
-                return [types.TextContent(type="text", text=str(results))]
+                output_format = arguments.get("format", "objects")
+                if output_format not in OUTPUT_FORMATS:
+                    raise ValueError(f"Unknown format: {output_format}")
+                db.log_query(arguments["query"])
+                offset = arguments.get("offset", 0)
+                if arguments.get("cursor"):
+                    offset = decode_cursor(arguments["query"], arguments["cursor"])
+                result = await db.fetch_page(arguments["query"], offset=offset, max_rows=arguments.get("max_rows"))
+                return [types.TextContent(type="text", text=format_page(arguments["query"], result, output_format))]
 
             elif name == "write_query":
                 if arguments["query"].strip().upper().startswith("SELECT"):
                     raise ValueError("SELECT queries are not allowed for write_query")
-                results = db._execute_query(arguments["query"])
+                db.log_query(arguments["query"])
+                results = await db.execute(arguments["query"], write=True)
                 return [types.TextContent(type="text", text=str(results))]
 
             elif name == "create_table":
                 if not arguments["query"].strip().upper().startswith("CREATE TABLE"):
                     raise ValueError("Only CREATE TABLE statements are allowed")
-                db._execute_query(arguments["query"])
+                await db.execute(arguments["query"], write=True)
                 return [types.TextContent(type="text", text="Table created successfully")]
 
+            elif name == "bulk_insert":
+                inserted = await db.bulk_insert(arguments["table_name"], arguments["columns"], arguments["rows"])
+                return [types.TextContent(type="text", text=str([{"inserted_rows": inserted}]))]
+
+            elif name == "import_file":
+                result = await db.import_file(arguments["path"], arguments["table_name"], arguments.get("format"))
+                return [types.TextContent(type="text", text=str([result]))]
+
+            elif name == "export_query":
+                if not arguments["query"].strip().upper().startswith("SELECT"):
+                    raise ValueError("Only SELECT queries are allowed for export_query")
+                db.log_query(arguments["query"])
+                result = await db.export_query(arguments["query"], arguments["path"], arguments.get("format"))
+                return [types.TextContent(type="text", text=str([result]))]
+
+            elif name == "explain_query":
+                plan = await db.explain(arguments["query"])
+                return [types.TextContent(type="text", text=plan)]
+
             else:
                 raise ValueError(f"Unknown tool: {name}")
 
@@ -366,17 +1538,20 @@ async def main(db_path: str):
         except Exception as e:
             return [types.TextContent(type="text", text=f"Error: {str(e)}")]
 
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        logger.info("Server running with stdio transport")
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="sqlite",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            logger.info("Server running with stdio transport")
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="sqlite",
+                    server_version="0.1.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        db.close()
@@ -0,0 +1,585 @@
+import asyncio
+import io
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from mcp_server_sqlite.server import (
+    MAX_COUNTED_ROWS,
+    QueryResult,
+    ResultCache,
+    SqliteDatabase,
+    _convert_value,
+    _infer_column_types,
+    _read_records,
+    advise_indexes,
+    decode_cursor,
+    encode_cursor,
+    format_page,
+    render_plan,
+    render_schema,
+)
+
+
+@pytest.fixture
+def db(tmp_path: Path):
+    database = SqliteDatabase(str(tmp_path / "test.db"))
+    asyncio.run(database.execute(
+        "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL, price REAL)", write=True
+    ))
+    yield database
+    database.close()
+
+
+def outside_connection(db: SqliteDatabase) -> sqlite3.Connection:
+    return sqlite3.connect(db.db_path, timeout=0)
+
+
+def test_result_cache_drops_entries_when_version_changes():
+    cache = ResultCache(max_entries=2)
+    assert cache.get(("a",), 1) is None
+    cache.put(("a",), 1, "first")
+    assert cache.get(("a",), 1) == "first"
+
+    assert cache.get(("a",), 2) is None
+    cache.put(("a",), 1, "stale")
+    assert cache.get(("a",), 2) is None
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    cache.get(("a",), 1)
+    cache.put(("a",), 1, "a")
+    cache.put(("b",), 1, "b")
+    cache.get(("a",), 1)
+    cache.put(("c",), 1, "c")
+
+    assert cache.get(("a",), 1) == "a"
+    assert cache.get(("b",), 1) is None
+    assert cache.get(("c",), 1) == "c"
+
+
+def test_fetch_page_cache_sees_outside_writes(db):
+    asyncio.run(db.execute("INSERT INTO items (name) VALUES ('a')", write=True))
+    query = "SELECT name FROM items ORDER BY id"
+    assert asyncio.run(db.fetch_page(query)).rows == [("a",)]
+
+    with closing(outside_connection(db)) as other:
+        other.execute("INSERT INTO items (name) VALUES ('b')")
+        other.commit()
+
+    assert asyncio.run(db.fetch_page(query)).rows == [("a",), ("b",)]
+
+
+def test_fetch_page_cache_ignores_whitespace(db):
+    asyncio.run(db.execute("INSERT INTO items (name) VALUES ('a b')", write=True))
+    first = asyncio.run(db.fetch_page("SELECT name FROM items WHERE name = 'a b'"))
+    second = asyncio.run(db.fetch_page("SELECT name\n  FROM items   WHERE name = 'a b'"))
+
+    assert second is first
+    assert first.rows == [("a b",)]
+
+
+@pytest.mark.parametrize("query", [
+    "INSERT INTO items (name) VALUES ('a')",
+    "REPLACE INTO items (id, name) VALUES (1, 'a')",
+    "/* comment */ INSERT INTO items (name) VALUES ('a')",
+    "  insert into items (name) values ('a')",
+])
+def test_write_query_commits(db, query):
+    result = asyncio.run(db.execute(query, write=True))
+
+    assert result == [{"affected_rows": 1}]
+    assert not db.conn.in_transaction
+    with closing(outside_connection(db)) as other:
+        assert other.execute("SELECT count(*) FROM items").fetchone() == (1,)
+        # The writer holds no lock, so another process can write straight away
+        other.execute("INSERT INTO items (name) VALUES ('b')")
+        other.commit()
+
+
+def test_write_query_with_returning_commits(db):
+    result = asyncio.run(db.execute("INSERT INTO items (name) VALUES ('a') RETURNING id", write=True))
+
+    assert result == [{"id": 1}]
+    assert not db.conn.in_transaction
+
+
+def test_failed_write_rolls_back(db):
+    with pytest.raises(sqlite3.IntegrityError):
+        asyncio.run(db.execute("INSERT INTO items (name) VALUES (NULL)", write=True))
+
+    assert not db.conn.in_transaction
+
+
+def test_connection_uses_tuned_pragmas(db):
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert db.conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert db.conn.execute("PRAGMA cache_size").fetchone()[0] == -64000
+    assert db.conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+
+
+RUNAWAY_QUERY = "WITH RECURSIVE r(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM r) SELECT count(*) FROM r"
+
+
+def test_query_is_interrupted_after_timeout(tmp_path: Path):
+    database = SqliteDatabase(str(tmp_path / "test.db"), query_timeout=0.2)
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="Query interrupted after exceeding the 0.2s timeout"):
+            asyncio.run(database.execute(RUNAWAY_QUERY, write=False))
+
+        # The deadline is per statement, so the next query on the same connection runs normally
+        assert asyncio.run(database.execute("SELECT 1 AS one", write=False)) == [{"one": 1}]
+    finally:
+        database.close()
+
+
+def test_concurrent_reads_share_the_reader_pool(db):
+    async def run() -> list[list[dict]]:
+        return await asyncio.gather(*(db.execute("SELECT count(*) AS n FROM items") for _ in range(8)))
+
+    assert asyncio.run(run()) == [[{"n": 0}]] * 8
+
+
+def test_decode_cursor_round_trips():
+    query = "SELECT * FROM items"
+    assert decode_cursor(query, encode_cursor(query, 40)) == 40
+    # Whitespace differences do not change the query a cursor belongs to
+    assert decode_cursor("SELECT *\n  FROM items", encode_cursor(query, 40)) == 40
+
+
+def test_decode_cursor_rejects_other_queries():
+    cursor = encode_cursor("SELECT * FROM items", 40)
+
+    with pytest.raises(ValueError, match="does not belong"):
+        decode_cursor("SELECT * FROM other", cursor)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor("SELECT * FROM items", "not a cursor")
+
+
+def insert_items(db: SqliteDatabase, count: int, name: str = "x") -> None:
+    asyncio.run(db.execute(
+        "INSERT INTO items (name) "
+        "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < :count) SELECT :name FROM n",
+        {"count": count, "name": name},
+        write=True,
+    ))
+
+
+def test_fetch_page_caps_rows(db):
+    insert_items(db, 25)
+
+    page = asyncio.run(db.fetch_page("SELECT id FROM items ORDER BY id", offset=5, max_rows=10))
+    assert page.rows == [(i,) for i in range(6, 16)]
+    assert page.offset == 5
+    assert (page.remaining, page.remaining_exact) == (10, True)
+
+
+def test_fetch_page_max_rows_is_capped_by_server_limit(tmp_path: Path):
+    database = SqliteDatabase(str(tmp_path / "test.db"), max_rows=3)
+    try:
+        page = asyncio.run(database.fetch_page(
+            "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 10) SELECT x FROM n",
+            max_rows=100,
+        ))
+        assert page.rows == [(1,), (2,), (3,)]
+        assert page.remaining == 7
+    finally:
+        database.close()
+
+
+@pytest.mark.parametrize("arguments", [{"max_rows": 0}, {"max_rows": -5}, {"offset": -1}])
+def test_fetch_page_rejects_invalid_paging_arguments(db, arguments):
+    insert_items(db, 5)
+
+    with pytest.raises(ValueError):
+        asyncio.run(db.fetch_page("SELECT id FROM items", **arguments))
+
+
+def test_fetch_page_counts_remaining_rows_up_to_the_limit(db):
+    insert_items(db, MAX_COUNTED_ROWS + 10)
+
+    page = asyncio.run(db.fetch_page("SELECT id FROM items", max_rows=10))
+    assert (page.remaining, page.remaining_exact) == (MAX_COUNTED_ROWS, True)
+
+    page = asyncio.run(db.fetch_page("SELECT id FROM items", max_rows=5))
+    assert (page.remaining, page.remaining_exact) == (MAX_COUNTED_ROWS, False)
+
+
+def test_fetch_page_stops_counting_runaway_results(db):
+    page = asyncio.run(db.fetch_page(
+        "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT x FROM n", max_rows=10
+    ))
+
+    assert len(page.rows) == 10
+    assert (page.remaining, page.remaining_exact) == (MAX_COUNTED_ROWS, False)
+
+
+def test_format_page_notes_truncation_and_cursor():
+    query = "SELECT x FROM n"
+    text = format_page(query, QueryResult(["x"], [(1,), (2,)], 0, MAX_COUNTED_ROWS, remaining_exact=False))
+
+    assert text.startswith("[{'x': 1}, {'x': 2}]")
+    assert f"{MAX_COUNTED_ROWS}+ more rows" in text
+    assert f'pass cursor "{encode_cursor(query, 2)}"' in text
+    assert "truncated" not in format_page(query, QueryResult(["x"], [(1,)], 0, 0))
+
+
+FORMAT_RESULT = QueryResult(["id", "name", "data"], [(1, "a,b", None), (2, "x|y\nz", b"\x01\xff")], 0, 0)
+
+
+def test_format_page_json():
+    assert json.loads(format_page("SELECT 1", FORMAT_RESULT, "json")) == {
+        "columns": ["id", "name", "data"],
+        "rows": [[1, "a,b", None], [2, "x|y\nz", "01ff"]],
+    }
+
+
+def test_format_page_json_reports_cursor_fields():
+    result = QueryResult(["x"], [(1,)], 0, MAX_COUNTED_ROWS, remaining_exact=False)
+
+    payload = json.loads(format_page("SELECT x FROM n", result, "json"))
+    assert payload["more_rows"] == MAX_COUNTED_ROWS
+    assert payload["more_rows_exact"] is False
+    assert payload["cursor"] == encode_cursor("SELECT x FROM n", 1)
+
+
+def test_format_page_csv():
+    assert format_page("SELECT 1", FORMAT_RESULT, "csv") == 'id,name,data\n1,"a,b",\n2,"x|y\nz",01ff'
+
+
+def test_format_page_tsv():
+    assert format_page("SELECT 1", FORMAT_RESULT, "tsv") == 'id\tname\tdata\n1\ta,b\t\n2\t"x|y\nz"\t01ff'
+
+
+def test_format_page_markdown():
+    assert format_page("SELECT 1", FORMAT_RESULT, "markdown") == (
+        "| id | name | data |\n"
+        "|---|---|---|\n"
+        "| 1 | a,b |  |\n"
+        "| 2 | x\\|y z | 01ff |"
+    )
+
+
+def test_format_page_rejects_unknown_format():
+    with pytest.raises(ValueError, match="Unknown format: xml"):
+        format_page("SELECT 1", FORMAT_RESULT, "xml")
+
+
+def test_bulk_insert_inserts_all_chunks(db, monkeypatch):
+    monkeypatch.setattr("mcp_server_sqlite.server.BULK_INSERT_CHUNK_SIZE", 2)
+
+    assert asyncio.run(db.bulk_insert("items", ["name", "price"], [["a", 1.5], ["b", None], ["c", 3]])) == 3
+    assert asyncio.run(db.execute("SELECT name, price FROM items ORDER BY id")) == [
+        {"name": "a", "price": 1.5},
+        {"name": "b", "price": None},
+        {"name": "c", "price": 3.0},
+    ]
+    assert not db.conn.in_transaction
+
+
+def test_bulk_insert_rolls_back_every_chunk_on_failure(db, monkeypatch):
+    monkeypatch.setattr("mcp_server_sqlite.server.BULK_INSERT_CHUNK_SIZE", 2)
+
+    # The NULL name fails in the second chunk, after the first one was inserted
+    with pytest.raises(sqlite3.IntegrityError):
+        asyncio.run(db.bulk_insert("items", ["name"], [["a"], ["b"], ["c"], [None]]))
+
+    assert not db.conn.in_transaction
+    assert asyncio.run(db.execute("SELECT count(*) AS n FROM items")) == [{"n": 0}]
+
+
+def test_bulk_insert_validates_rows(db):
+    with pytest.raises(ValueError, match="Row 2 has 1 values, expected 2"):
+        asyncio.run(db.bulk_insert("items", ["name", "price"], [["a", 1], ["b"]]))
+    with pytest.raises(ValueError, match="At least one column is required"):
+        asyncio.run(db.bulk_insert("items", [], [[]]))
+
+    assert asyncio.run(db.execute("SELECT count(*) AS n FROM items")) == [{"n": 0}]
+
+
+def test_bulk_insert_quotes_identifiers(db):
+    asyncio.run(db.execute('CREATE TABLE "odd table" ("select" TEXT, "a""b" INTEGER)', write=True))
+
+    asyncio.run(db.bulk_insert("odd table", ["select", 'a"b'], [["x", 1]]))
+    assert asyncio.run(db.execute('SELECT * FROM "odd table"')) == [{"select": "x", 'a"b': 1}]
+
+
+def test_import_and_export_round_trip(db, tmp_path: Path):
+    source = tmp_path / "people.csv"
+    source.write_text("name,age,score\nann,31,\nbob,27,4.5\n")
+
+    result = asyncio.run(db.import_file(str(source), "people"))
+    assert result == {
+        "table": "people",
+        "imported_rows": 2,
+        "created": True,
+        "columns": {"name": "TEXT", "age": "INTEGER", "score": "REAL"},
+    }
+
+    target = tmp_path / "people.jsonl"
+    exported = asyncio.run(db.export_query("SELECT * FROM people ORDER BY name", str(target)))
+    assert exported == {"path": str(target), "exported_rows": 2}
+    assert target.read_text().splitlines() == [
+        '{"name": "ann", "age": 31, "score": null}',
+        '{"name": "bob", "age": 27, "score": 4.5}',
+    ]
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT * FROM missing",
+    # Fails with an integer overflow only after thousands of rows were written
+    "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 5000) "
+    "SELECT CASE WHEN x < 4000 THEN x ELSE abs(-9223372036854775808) END FROM n",
+])
+def test_failed_export_keeps_existing_file(db, tmp_path: Path, query):
+    target = tmp_path / "out.csv"
+    target.write_text("previous export\n")
+
+    with pytest.raises(sqlite3.Error):
+        asyncio.run(db.export_query(query, str(target)))
+
+    assert target.read_text() == "previous export\n"
+    assert not list(tmp_path.glob(".out.csv.*.tmp"))
+
+
+def test_read_records_csv():
+    columns, records = _read_records(io.StringIO("id,name\n1,a\n2,b\n"), "csv")
+
+    assert columns == ["id", "name"]
+    assert list(records) == [["1", "a"], ["2", "b"]]
+
+
+def test_read_records_csv_rejects_ragged_rows():
+    _, records = _read_records(io.StringIO("id,name\n1,a\n2\n"), "csv")
+
+    with pytest.raises(ValueError, match="Line 3 has 1 fields, expected 2"):
+        list(records)
+
+
+def test_read_records_jsonl_collects_keys_from_sample():
+    f = io.StringIO('{"id": 1}\n\n{"id": 2, "tags": ["a"]}\n')
+    columns, records = _read_records(f, "jsonl")
+
+    assert columns == ["id", "tags"]
+    assert list(records) == [[1, None], [2, ["a"]]]
+
+
+def test_read_records_jsonl_rejects_non_objects():
+    with pytest.raises(ValueError, match="Line 1 is not a JSON object"):
+        _read_records(io.StringIO("[1, 2]\n"), "jsonl")
+
+
+def test_infer_column_types():
+    sample = [
+        ["1", "1.5", "a", "", 1, True, "-3", ".5e3"],
+        ["2", "2", "3", "", 2.5, False, "+4", "1E-2"],
+    ]
+
+    assert _infer_column_types(["a", "b", "c", "d", "e", "f", "g", "h"], sample) == [
+        "INTEGER", "REAL", "TEXT", "TEXT", "REAL", "INTEGER", "INTEGER", "REAL"
+    ]
+
+
+@pytest.mark.parametrize("value", [
+    "1_000", "nan", "NaN", "inf", "-Infinity", " 1", "1 ", "١٢", "0x10", "1e999",
+])
+def test_infer_column_types_keeps_non_plain_numbers_as_text(value):
+    assert _infer_column_types(["a"], [["1"], [value]]) == ["TEXT"]
+    assert _convert_value(value, "INTEGER") == value
+    assert _convert_value(value, "REAL") == value
+
+
+def test_convert_value():
+    assert _convert_value("12", "INTEGER") == 12
+    assert _convert_value("12", "REAL") == 12.0
+    assert _convert_value("-1.5e2", "REAL") == -150.0
+    assert _convert_value("", "INTEGER") is None
+    assert _convert_value("", "TEXT") == ""
+    assert _convert_value({"a": [1]}, "TEXT") == '{"a": [1]}'
+    # Integers too large for SQLite are stored as REAL rather than failing to bind
+    assert _infer_column_types(["a"], [[str(2**63)]]) == ["REAL"]
+
+
+def test_render_plan_draws_tree_and_flags_slow_steps():
+    plan = [
+        (3, 0, "SEARCH items USING INTEGER PRIMARY KEY (rowid=?)"),
+        (7, 0, "LIST SUBQUERY 1"),
+        (9, 7, "SCAN items"),
+        (12, 7, "SCAN CONSTANT ROW"),
+        (28, 0, "USE TEMP B-TREE FOR ORDER BY"),
+    ]
+
+    assert render_plan(plan) == (
+        "QUERY PLAN\n"
+        "|--SEARCH items USING INTEGER PRIMARY KEY (rowid=?)\n"
+        "|--LIST SUBQUERY 1\n"
+        "|  |--SCAN items  <-- full table scan\n"
+        "|  `--SCAN CONSTANT ROW\n"
+        "`--USE TEMP B-TREE FOR ORDER BY  <-- temporary B-tree\n"
+        "\n"
+        "2 step(s) flagged; suggest_indexes can propose indexes for logged queries"
+    )
+
+
+def test_render_plan_without_slow_steps():
+    assert render_plan([(2, 0, "SCAN items USING COVERING INDEX idx_items_name")]) == (
+        "QUERY PLAN\n`--SCAN items USING COVERING INDEX idx_items_name"
+    )
+
+
+def test_explain_sees_indexes_created_after_earlier_plans(db):
+    query = "SELECT id FROM items WHERE name = 'a'"
+    assert "SCAN items  <-- full table scan" in asyncio.run(db.explain(query))
+
+    asyncio.run(db.execute("CREATE INDEX idx_items_name ON items (name)", write=True))
+    plan = asyncio.run(db.explain(query))
+    assert "SEARCH items USING COVERING INDEX idx_items_name (name=?)" in plan
+    assert "flagged" not in plan
+
+
+def test_advise_indexes_suggests_filtered_and_sorted_columns():
+    schema = [
+        "CREATE TABLE orders (id INTEGER PRIMARY KEY, customer TEXT, total REAL, created TEXT)",
+        "CREATE INDEX idx_orders_created ON orders (created)",
+    ]
+    queries = [
+        ("SELECT * FROM orders WHERE customer = 'x'", 5),
+        ("SELECT * FROM orders ORDER BY total", 2),
+        # Already served by an existing index or the primary key
+        ("SELECT * FROM orders WHERE created > '2024'", 9),
+        ("SELECT * FROM orders WHERE id = 1", 9),
+    ]
+
+    suggestions = advise_indexes(schema, queries)
+
+    assert [(s["column"], s["executions"]) for s in suggestions] == [("customer", 5), ("total", 2)]
+    assert suggestions[0]["statement"] == 'CREATE INDEX IF NOT EXISTS "idx_orders_customer" ON "orders" ("customer")'
+
+
+def test_advise_indexes_skips_invalid_queries():
+    schema = ["CREATE TABLE orders (id INTEGER PRIMARY KEY, customer TEXT)"]
+
+    assert advise_indexes(schema, [("SELECT * FROM missing WHERE customer = 1", 1)]) == []
+
+
+def test_suggest_indexes_creates_indexes_for_logged_queries(db):
+    for _ in range(3):
+        db.log_query("SELECT * FROM items WHERE name = 'a'")
+
+    suggestions = asyncio.run(db.suggest_indexes(create=True))
+
+    assert [(s["column"], s["executions"], s["created"]) for s in suggestions] == [("name", 3, True)]
+    assert "USING INDEX" in asyncio.run(db.explain("SELECT * FROM items WHERE name = 'a'"))
+    assert asyncio.run(db.suggest_indexes()) == []
+
+
+def test_render_schema():
+    columns = [
+        ("orders", "table", "id", "INTEGER", 0, None, 1),
+        ("orders", "table", "customer", "TEXT", 1, None, 0),
+        ("orders", "table", "status", "TEXT", 0, "'new'", 0),
+        ("order lines", "table", "order_id", "INTEGER", 0, None, 1),
+        ("order lines", "table", "line", "INTEGER", 0, None, 2),
+        ("open_orders", "view", "id", "INTEGER", 0, None, 0),
+    ]
+    indexes = [
+        ("orders", "idx_orders_customer", 0, "c", "customer"),
+        ("orders", "idx_orders_expr", 0, "c", None),
+        ("orders", "sqlite_autoindex_orders_1", 1, "u", "status"),
+        ("order lines", "sqlite_autoindex_order lines_1", 1, "pk", "order_id"),
+    ]
+    foreign_keys = [("order lines", 0, "orders", "order_id", "id")]
+
+    assert render_schema(columns, indexes, foreign_keys) == "\n".join([
+        "orders(id INTEGER PRIMARY KEY, customer TEXT NOT NULL, status TEXT DEFAULT 'new')",
+        "  INDEX idx_orders_customer(customer)",
+        "  INDEX idx_orders_expr(<expr>)",
+        "  UNIQUE(status)",
+        '"order lines"(order_id INTEGER, line INTEGER, PRIMARY KEY(order_id, line), '
+        "FOREIGN KEY(order_id) REFERENCES orders(id))",
+        "VIEW open_orders(id INTEGER)",
+    ])
+
+
+def test_render_schema_without_tables():
+    assert render_schema([], [], []) == "The database has no tables"
+
+
+def test_describe_schema_is_refreshed_after_schema_changes(db):
+    assert asyncio.run(db.describe_schema()) == "items(id INTEGER PRIMARY KEY, name TEXT NOT NULL, price REAL)"
+
+    asyncio.run(db.execute("CREATE INDEX idx_items_name ON items (name)", write=True))
+    assert asyncio.run(db.describe_schema()).endswith("\n  INDEX idx_items_name(name)")
+
+
+@pytest.mark.parametrize("has_table_list", [
+    pytest.param(True, marks=pytest.mark.skipif(sqlite3.sqlite_version_info < (3, 37, 0), reason="SQLite < 3.37")),
+    False,
+])
+def test_describe_schema_hides_only_shadow_tables(db, monkeypatch, has_table_list):
+    monkeypatch.setattr("mcp_server_sqlite.server.HAS_TABLE_LIST", has_table_list)
+    asyncio.run(db.execute("CREATE VIRTUAL TABLE docs USING fts5(body)", write=True))
+    # Named like a shadow table of docs, but created by the user
+    asyncio.run(db.execute("CREATE TABLE docs_meta (doc_id INTEGER)", write=True))
+
+    assert asyncio.run(db.describe_schema()).splitlines() == [
+        "VIRTUAL TABLE docs(body)",
+        "docs_meta(doc_id INTEGER)",
+        "items(id INTEGER PRIMARY KEY, name TEXT NOT NULL, price REAL)",
+    ]
+
+
+def test_fetch_page_caps_bytes(tmp_path: Path):
+    database = SqliteDatabase(str(tmp_path / "test.db"), max_result_bytes=250)
+    try:
+        asyncio.run(database.execute("CREATE TABLE blobs (data TEXT)", write=True))
+        asyncio.run(database.bulk_insert("blobs", ["data"], [["x" * 100] for _ in range(10)]))
+
+        page = asyncio.run(database.fetch_page("SELECT data FROM blobs"))
+        assert len(page.rows) == 2
+        assert page.remaining == 8
+
+        # A single row larger than the cap is still returned
+        asyncio.run(database.execute("DELETE FROM blobs", write=True))
+        asyncio.run(database.bulk_insert("blobs", ["data"], [["x" * 1000]]))
+        assert len(asyncio.run(database.fetch_page("SELECT data FROM blobs")).rows) == 1
+    finally:
+        database.close()
+
+
+def test_cancelled_query_is_interrupted(tmp_path: Path):
+    # A single reader without a timeout is only freed if cancelling interrupts the query
+    database = SqliteDatabase(str(tmp_path / "test.db"), readers=1, query_timeout=None)
+
+    async def run() -> list[dict]:
+        task = asyncio.create_task(database.execute(RUNAWAY_QUERY, write=False))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return await asyncio.wait_for(database.execute("SELECT 1 AS one", write=False), timeout=5)
+
+    try:
+        assert asyncio.run(run()) == [{"one": 1}]
+    finally:
+        database.close()
+
+
+def test_reader_connections_refuse_writes(db):
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        asyncio.run(db.execute("INSERT INTO items (name) VALUES ('a')", write=False))
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        asyncio.run(db.execute("CREATE TABLE other (id INTEGER)", write=False))
+
+    assert asyncio.run(db.execute("SELECT count(*) AS n FROM items")) == [{"n": 0}]
+
+
+def test_readers_see_committed_writes(db):
+    assert asyncio.run(db.execute("SELECT count(*) AS n FROM items")) == [{"n": 0}]
+
+    asyncio.run(db.execute("INSERT INTO items (name) VALUES ('a')"))
+    assert asyncio.run(db.execute("SELECT name FROM items")) == [{"name": "a"}]